@@ -1,7 +1,6 @@
+import concurrent.futures
 import unittest
 import sys
-from tmtc.tmtc_py4j import *
-import context
 
 # FIND IN GITLAB or on BA_BOI
 classpath = '/create/a/classpath/'
@@ -10,188 +9,196 @@ classpath = '/create/a/classpath/'
 scdbpath = '/create/a/scbdpath/'
 
 # Configuration of the connection to the onboard software
-obsw_connection = TCPClient(configuration='AUTH SCID1 CCSDS_TM_DATALINK')
+obsw_configuration = 'AUTH SCID1 CCSDS_TM_DATALINK'
+_obsw_connection = None
 
-# Global connection
-tmtc = TMTCPy4j(classpath, obsw_connection, scdbpath)
 
+def _get_obsw_connection():
+    """Create the connection to the onboard software on first use"""
+    global _obsw_connection
+    if _obsw_connection is None:
+        from tmtc.tmtc_py4j import TCPClient
+        _obsw_connection = TCPClient(configuration=obsw_configuration)
+    return _obsw_connection
 
-class TestCommandExecution(unittest.TestCase):
-
-    def setUp(self):
-        pass
 
-    # HK_BEACON Actions
-    def test_hkbeacon_reset(self):
-        result = tmtc.invoke('chd.tmtc.HKBeacon.reset')
-        print(type(result))
+def __getattr__(name):
+    # Keep 'obsw_connection' available as a module attribute without
+    # constructing it at import time
+    if name == 'obsw_connection':
+        return _get_obsw_connection()
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
 
-    def test_hkbeacon_send(self):
-        result = tmtc.invoke('chd.tmtc.HKBeacon.send')
-        print(type(result))
 
+# Actions exercised by the Command Execution Test, grouped by component
+COMMANDS = [
+    # HK_BEACON Actions
+    'chd.tmtc.HKBeacon.reset',
+    'chd.tmtc.HKBeacon.send',
     # TMDebug Actions
-    def test_tmdebug_reset(self):
-        result = tmtc.invoke('chd.tmtc.TMDebug.reset')
-        print(type(result))
-
+    'chd.tmtc.TMDebug.reset',
     # TMTCEvent Actions
-    def test_tmtcevent_reset(self):
-        result = tmtc.invoke('chd.tmtc.TMTCEvent.reset')
-        print(type(result))
-
-    def test_tmtcevent_forwardEvent(self):
-        result = tmtc.invoke('chd.tmtc.TMTCEvent.forwardEvent')
-        print(type(result))
-
+    'chd.tmtc.TMTCEvent.reset',
+    'chd.tmtc.TMTCEvent.forwardEvent',
     # TMTCTransfer Actions
-    def test_tmtctransfer_clearGetTransfer(self):
-        result = tmtc.invoke('chd.tmtc.TMTCTransfer.clearGetTransfer')
-        print(type(result))
-
-    def test_tmtctransfer_clearSetTransfer(self):
-        result = tmtc.invoke('chd.tmtc.TMTCTransfer.clearSetTransfer')
-        print(type(result))
-
+    'chd.tmtc.TMTCTransfer.clearGetTransfer',
+    'chd.tmtc.TMTCTransfer.clearSetTransfer',
     # WatchdogPeriodicAction Actions
-    def test_watchdogperiodicaction_clear(self):
-        result = tmtc.invoke('chd.WatchdogPeriodicAction.clear')
-        print(type(result))
-
-    def test_watchdogperiodicaction_reset(self):
-        result = tmtc.invoke('chd.WatchdogPeriodicAction.reset')
-        print(type(result))
-
+    'chd.WatchdogPeriodicAction.clear',
+    'chd.WatchdogPeriodicAction.reset',
     # Storage Actions
-    def test_storage_wipe(self):
-        result = tmtc.invoke('core.Storage.wipe')
-        print(type(result))
-
-    def test_storage_getParamToChannel(self):
-        result = tmtc.invoke('core.Storage.getParamToChannel')
-        print(type(result))
-
-    def test_storage_getParamFromChannel(self):
-        result = tmtc.invoke('core.Storage.getParamFromChannel')
-        print(type(result))
-
+    'core.Storage.wipe',
+    'core.Storage.getParamToChannel',
+    'core.Storage.getParamFromChannel',
     # ConfigurationManager Actions
-    def test_configurationmanager_resetAll(self):
-        result = tmtc.invoke('core.ConfigurationManager.resetAll')
-        print(type(result))
+    'core.ConfigurationManager.resetAll',
+    'core.ConfigurationManager.loadAll',
+    'core.ConfigurationManager.storeAll',
+    'core.ConfigurationManager.loadProfile',
+    'core.ConfigurationManager.load',
+    'core.ConfigurationManager.store',
+    'core.ConfigurationManager.erase',
+    'core.ConfigurationManager.eraseConfig',
+    'core.ConfigurationManager.eraseAll',
+    # OBT Actions
+    'core.OBT.reset',
+    'core.OBT.update',
+    # EventDispatcher Actions
+    'core.EventDispatcher.reset',
+    # OBC Actions
+    'platform.obc.OBC.reset',
+    'platform.obc.OBC.kickWatchdog',
+    'platform.obc.OBC.markCurrentImageStable',
+    'platform.obc.OBC.clearImage',
+    'platform.obc.OBC.updateImageCrc',
+    'platform.obc.OBC.resetGPS',
+    'platform.obc.OBC.resetGyros',
+    # Time Actions
+    'platform.obc.Time.reset',
+    'platform.obc.Time.refresh',
+    # GPIO Actions
+    'platform.obc.GPIO.reset',
+    # PlatformI2C Actions
+    'platform.obc.PlatformI2c.resetStatistics',
+    # PlatformSPI Actions
+    'platform.obc.PlatformSPI.resetErrors',
+    # STX Actions
+    'platform.STX.reset',
+]
 
-    def test_configurationmanager_loadAll(self):
-        result = tmtc.invoke('core.ConfigurationManager.loadAll')
-        print(type(result))
+# Commands sent concurrently in the opt-in parallel pass. Only commands
+# that read onboard state or are idempotent belong here: anything that
+# changes state (loads, stores, resets, image and watchdog updates) gives
+# an order dependent result when raced against the others
+PARALLEL_COMMANDS = [
+    'chd.tmtc.HKBeacon.send',
+    'chd.tmtc.TMTCEvent.forwardEvent',
+    'core.Storage.getParamToChannel',
+    'core.Storage.getParamFromChannel',
+    'platform.obc.Time.refresh',
+]
 
-    def test_configurationmanager_storeAll(self):
-        result = tmtc.invoke('core.ConfigurationManager.storeAll')
-        print(type(result))
+# Action name -> onboard id, resolved against the SCDB on first use
+_action_ids = {}
 
-    def test_configurationmanager_loadProfile(self):
-        result = tmtc.invoke('core.ConfigurationManager.loadProfile')
-        print(type(result))
 
-    def test_configurationmanager_load(self):
-        result = tmtc.invoke('core.ConfigurationManager.load')
-        print(type(result))
+def _invoke(tmtc, action_name):
+    """Invoke an action by name, only resolving the name to an id once"""
+    action_id = _action_ids.get(action_name)
+    if action_id is None:
+        action_id = tmtc.model.name_to_action_id(action_name)
+        _action_ids[action_name] = action_id
+    return tmtc.invoke(action_id)
 
-    def test_configurationmanager_store(self):
-        result = tmtc.invoke('core.ConfigurationManager.store')
-        print(type(result))
 
-    def test_configurationmanager_erase(self):
-        result = tmtc.invoke('core.ConfigurationManager.erase')
-        print(type(result))
+# Single connection held open for the whole module: starting the JVM and
+# connecting to the OBSW is far more expensive than any one invoke(), so
+# every test class reuses this session rather than reconnecting
+_tmtc = None
 
-    def test_configurationmanager_eraseConfig(self):
-        result = tmtc.invoke('core.ConfigurationManager.eraseConfig')
-        print(type(result))
 
-    def test_configurationmanager_eraseAll(self):
-        result = tmtc.invoke('core.ConfigurationManager.eraseAll')
-        print(type(result))
+def setUpModule():
+    # Imported here rather than at module scope so that test discovery
+    # and listing don't pull in the Py4J client
+    from tmtc.tmtc_py4j import TMTCPy4j, TMTCModelQueryError
 
-    # OBT Actions
-    def test_obt_reset(self):
-        result = tmtc.invoke('core.OBT.reset')
-        print(type(result))
+    global _tmtc
+    _tmtc = TMTCPy4j(
+        classpath, _get_obsw_connection(), scdbpath).__enter__()
 
-    def test_obt_update(self):
-        result = tmtc.invoke('core.OBT.update')
-        print(type(result))
+    # Resolve the whole command table against the SCDB in one pass so
+    # the tests themselves only pay for the invokeAction round-trips.
+    # Unknown names are left for their subtest to report.
+    for command in COMMANDS:
+        try:
+            _action_ids[command] = _tmtc.model.name_to_action_id(command)
+        except TMTCModelQueryError:
+            pass
 
-    # EventDispatcher Actions
-    def test_eventdispatcher_reset(self):
-        result = tmtc.invoke('core.EventDispatcher.reset')
-        print(type(result))
 
-    # OBC Actions
-    def test_obc_reset(self):
-        result = tmtc.invoke('platform.obc.OBC.reset')
-        print(type(result))
+def tearDownModule():
+    _tmtc.__exit__(None, None, None)
 
-    def test_obc_kickWatchdog(self):
-        result = tmtc.invoke('platform.obc.OBC.kickWatchdog')
-        print(type(result))
 
-    def test_obc_markCurrentImageStable(self):
-        result = tmtc.invoke('platform.obc.OBC.markCurrentImageStable')
-        print(type(result))
+class TestCommandExecution(unittest.TestCase):
 
-    def test_obc_clearImage(self):
-        result = tmtc.invoke('platform.obc.OBC.clearImage')
-        print(type(result))
+    @classmethod
+    def setUpClass(cls):
+        cls.tmtc = _tmtc
 
-    def test_obc_updateImageCrc(self):
-        result = tmtc.invoke('platform.obc.OBC.updateImageCrc')
-        print(type(result))
+    def test_all_commands(self):
+        # invoke() raises on a NACK or timeout; each command is reported as
+        # its own subtest so one failure doesn't mask the rest
+        for command in COMMANDS:
+            with self.subTest(command=command):
+                self.assertIsNone(_invoke(self.tmtc, command))
 
-    def test_obc_resetGPS(self):
-        result = tmtc.invoke('platform.obc.OBC.resetGPS')
-        print(type(result))
 
-    def test_obc_resetGyros(self):
-        result = tmtc.invoke('platform.obc.OBC.resetGyros')
-        print(type(result))
+class TestCommandExecutionParallel(unittest.TestCase):
+    """Opt-in pass sending the read-only commands concurrently"""
 
-    # Time Actions
-    def test_time_reset(self):
-        result = tmtc.invoke('platform.obc.Time.reset')
-        print(type(result))
+    @classmethod
+    def setUpClass(cls):
+        cls.tmtc = _tmtc
+        cls.pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
 
-    def test_time_refresh(self):
-        result = tmtc.invoke('platform.obc.Time.refresh')
-        print(type(result))
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
 
-    # GPIO Actions
-    def test_gpio_reset(self):
-        result = tmtc.invoke('platform.obc.GPIO.reset')
-        print(type(result))
+    def test_all_commands_parallel(self):
+        # Each invoke() is a blocking round-trip to the OBSW, so issue the
+        # independent commands concurrently rather than back to back
+        futures = [self.pool.submit(_invoke, self.tmtc, command)
+                   for command in PARALLEL_COMMANDS]
+        for command, future in zip(PARALLEL_COMMANDS, futures):
+            with self.subTest(command=command):
+                self.assertIsNone(future.result())
 
-    # PlatformI2C Actions
-    def test_platformi2c_resetStatistics(self):
-        result = tmtc.invoke('platform.obc.PlatformI2c.resetStatistics')
-        print(type(result))
 
-    # PlatformSPI Actions
-    def test_platformspi_resetErrors(self):
-        result = tmtc.invoke('platform.obc.PlatformSPI.resetErrors')
-        print(type(result))
+def suite(parallel=False):
+    # The tests are known statically, no need to scan the module for them
+    tests = unittest.TestSuite([TestCommandExecution('test_all_commands')])
+    if parallel:
+        tests.addTest(
+            TestCommandExecutionParallel('test_all_commands_parallel'))
+    return tests
 
-    # STX Actions
-    def test_stx_reset(self):
-        result = tmtc.invoke('platform.STX.reset')
-        print(type(result))
 
+def load_tests(loader, tests, pattern):
+    # Discovery runs every command once; the parallel pass is only run
+    # when asked for through main()
+    return suite()
 
-def main(out=sys.stderr, verbosity=2):
-    loader = unittest.TestLoader()
 
-    suite = loader.loadTestsFromModule(sys.modules[__name__])
-    unittest.TextTestRunner(out, verbosity=verbosity).run(suite)
+def main(out=sys.stderr, verbosity=1, parallel=False):
+    unittest.TextTestRunner(out, verbosity=verbosity).run(suite(parallel))
 
 
 if __name__ == '__main__':
-    with open('MOCI_CMD_EXE.log', 'w') as f:
-        main(f)
\ No newline at end of file
+    # Per-test names and status are only written to the log with --verbose
+    verbosity = 2 if '--verbose' in sys.argv[1:] else 1
+    parallel = '--parallel' in sys.argv[1:]
+    with open('MOCI_CMD_EXE.log', 'w', buffering=1 << 16) as f:
+        main(f, verbosity, parallel)
@@ -0,0 +1,565 @@
+import copy
+import dataclasses
+import itertools
+import pickle
+import tempfile
+import types
+import unittest
+
+from py4j.protocol import Py4JError, Py4JJavaError
+
+from tmtc.tmtc_py4j import (
+    ComponentInstance, Documentation, ModelInspector, OnboardException,
+    OBSWExceptionError, ParameterDefinition, ParameterInstance,
+    TMTCCommandError, TMTCModelQueryError, TMTCPy4j, TMTCTransferError,
+    TypeClass, TypeStr, _OutputRingBuffer, _TransferListener)
+
+
+class _JavaElement:
+    """Stands in for a TMTCLib model element instance"""
+
+    def __init__(self, id_, full_name, signature='', name=None,
+                 **collections):
+        self._id = id_
+        self._full_name = full_name
+        self._name = name
+        self._signature = signature
+        self._collections = collections
+
+    def getId(self):
+        return self._id
+
+    def getName(self):
+        if self._name is not None:
+            return self._name
+        return self._full_name.rsplit('.', 1)[-1]
+
+    def getFullName(self):
+        return self._full_name
+
+    def getDescription(self):
+        return ''
+
+    def getDocumentationAsText(self):
+        return ''
+
+    def getDocumentationAsHtml(self):
+        return ''
+
+    def getIndex(self):
+        return 0
+
+    def getType(self):
+        return self
+
+    def getSignature(self):
+        return self._signature
+
+    def __getattr__(self, name):
+        # getActions(), getParameters(), ...
+        if name.startswith('get'):
+            collection = self._collections.get(name[3].lower() + name[4:])
+            if collection is not None:
+                return lambda: collection
+        raise AttributeError(name)
+
+
+class _JavaCollection:
+    """Stands in for a TMTCLib deployment element collection"""
+
+    def __init__(self, *j_elements, names=None):
+        self._by_id = {
+            j_element.getId(): j_element for j_element in j_elements}
+        # Name -> element as TMTCLib resolves it, by full name unless given
+        self._by_name = names if names is not None else {
+            j_element.getFullName(): j_element for j_element in j_elements}
+        self.by_name_calls = 0
+
+    def getAllById(self):
+        return self
+
+    def iterator(self):
+        return iter(self._by_id.values())
+
+    def getById(self, id_):
+        return self._by_id.get(id_)
+
+    def getByName(self, name):
+        self.by_name_calls += 1
+        return self._by_name.get(name)
+
+
+def _inspector(**collections):
+    """Build a ModelInspector over fake collections, without a gateway"""
+    inspector = ModelInspector.__new__(ModelInspector)
+    inspector.j_deployment_instance = object()
+    for name in ModelInspector.__slots__:
+        if name.startswith('_j_') and name != '_j_variable_argument_class':
+            setattr(inspector, name,
+                    collections.get(name[3:], _JavaCollection()))
+    inspector._clear_lookup_trees()
+    inspector._argument_lookup_trees = {}
+    inspector._j_groups_by_id = None
+    inspector._sub_group_ids = None
+    inspector._lookup_cache = {}
+    return inspector
+
+
+class TestComponentInstance(unittest.TestCase):
+
+    def setUp(self):
+        j_exceptions = _JavaCollection(_JavaElement(7, 'sys.core.C.error'))
+        empty = _JavaCollection()
+        self.inspector = _inspector(
+            components=_JavaCollection(_JavaElement(
+                3, 'sys.core.C', 'core.C',
+                actions=empty, parameters=empty, events=empty,
+                eventSources=empty, exceptions=j_exceptions)),
+            exceptions=j_exceptions)
+
+    def test_name_and_id_lookups_compare_equal(self):
+        by_name = self.inspector.component_instance('core.C')
+        by_id = self.inspector.component_instance(3)
+        self.assertIsNot(by_name, by_id)
+        self.assertEqual(by_name, by_id)
+        self.assertEqual(
+            [exception.full_name for exception in by_id.exceptions],
+            ['sys.core.C.error'])
+
+    def test_children_are_plain_fields(self):
+        component = self.inspector.component_instance(3)
+        as_dict = dataclasses.asdict(component)
+        self.assertEqual(as_dict['actions'], ())
+        self.assertEqual(as_dict['exceptions'][0]['id'], 7)
+        self.assertIn('exceptions=(OnboardException(', repr(component))
+
+    def test_cached_children_are_immutable(self):
+        # The same object is handed to every caller of the lookup
+        component = self.inspector.component_instance(3)
+        self.assertIs(self.inspector.component_instance(3), component)
+        self.assertIsInstance(component.exceptions, tuple)
+
+    def test_copy_and_pickle(self):
+        component = self.inspector.component_instance(3)
+        self.assertEqual(copy.deepcopy(component), component)
+        self.assertEqual(pickle.loads(pickle.dumps(component)), component)
+
+    def test_construct_with_child_lists(self):
+        documentation = Documentation(text='', html='')
+        exception = OnboardException(
+            id=7, name='error', full_name='sys.core.C.error', description='',
+            documentation=documentation, index=0)
+        component = ComponentInstance(
+            id=3, name='C', full_name='sys.core.C', description='',
+            documentation=documentation, index=0, signature='core.C',
+            actions=(), parameters=(), events=(), event_sources=(),
+            exceptions=(exception,))
+        self.assertEqual(component, self.inspector.component_instance(3))
+
+
+class TestNamedTupleCompatibility(unittest.TestCase):
+
+    def test_tuple_operations(self):
+        documentation = Documentation(text='plain', html='<p>plain</p>')
+        text, html = documentation
+        self.assertEqual((text, html), ('plain', '<p>plain</p>'))
+        self.assertEqual(documentation[1], '<p>plain</p>')
+        self.assertEqual(len(documentation), 2)
+        self.assertEqual(documentation._fields, ('text', 'html'))
+        self.assertEqual(documentation._asdict(),
+                         {'text': 'plain', 'html': '<p>plain</p>'})
+        self.assertEqual(documentation._replace(html=''),
+                         Documentation(text='plain', html=''))
+
+
+class TestNameToId(unittest.TestCase):
+
+    def setUp(self):
+        self.j_parameters = _JavaCollection(
+            # 'Dotted' names such as datapool parameters are left out of
+            # the partial name lookup tree
+            _JavaElement(5, 'core.C.d.p', name='d.p'),
+            _JavaElement(6, 'sys.core.C.d.p'),
+            _JavaElement(7, 'sys.core.D.p'))
+        self.inspector = _inspector(parameters=self.j_parameters)
+
+    def tearDown(self):
+        # Names are resolved locally, without a round-trip to Java
+        self.assertEqual(self.j_parameters.by_name_calls, 0)
+
+    def test_exact_name_beats_unique_suffix(self):
+        self.assertEqual(self.inspector.name_to_parameter_id('core.C.d.p'), 5)
+        self.assertEqual(
+            self.inspector.name_to_parameter_id('sys.core.C.d.p'), 6)
+
+    def test_partial_name(self):
+        self.assertEqual(self.inspector.name_to_parameter_id('C.d.p'), 6)
+        self.assertEqual(self.inspector.name_to_parameter_id('D.p'), 7)
+
+    def test_ambiguous_name(self):
+        with self.assertRaisesRegex(TMTCModelQueryError, 'ambiguous'):
+            self.inspector.name_to_parameter_id('p')
+
+    def test_unknown_name(self):
+        with self.assertRaisesRegex(TMTCModelQueryError, 'No matching'):
+            self.inspector.name_to_parameter_id('E.p')
+
+
+def _parameter_instance(type_str=TypeStr.unsigned, max_rows=4,
+                        bytes_per_row=4, is_fixed_size=True):
+    documentation = Documentation(text='', html='')
+    return ParameterInstance(
+        id=9, name='p', full_name='sys.core.C.p', description='',
+        documentation=documentation, index=0,
+        definition=ParameterDefinition(
+            signature='', type_str=type_str,
+            type_class=TypeClass.fixed_vector, min_rows=1, max_rows=max_rows,
+            bits_per_row=bytes_per_row * 8, bytes_per_row=bytes_per_row,
+            storage_bytes_per_row=bytes_per_row, unused_bits_per_row=0,
+            is_raw=type_str in (TypeStr.raw, TypeStr.varaw),
+            is_fixed_size=is_fixed_size, is_read_only=False,
+            is_config=False))
+
+
+class _Model:
+    """Stands in for ModelInspector, counting parameter lookups"""
+
+    def __init__(self, parameter_instance):
+        self._parameter_instance = parameter_instance
+        self.lookups = 0
+
+    def parameter_instance(self, parameter):
+        self.lookups += 1
+        return self._parameter_instance
+
+    def onboard_exception(self, exception_code):
+        return OnboardException(
+            id=exception_code, name='error', full_name='sys.core.C.error',
+            description='Something went wrong',
+            documentation=Documentation(text='', html=''), index=0)
+
+
+class _Value:
+    """Stands in for a com.brightascension.gen1.util.ByteArray"""
+
+    def __init__(self, value):
+        self._value = value
+
+    def getUnsignedValue(self):
+        return self._value
+
+
+class _JavaException:
+    """Stands in for a Java exception raised through Py4J"""
+
+    def __init__(self, string, exception_code=None, cause=None):
+        self._string = string
+        self._exception_code = exception_code
+        self._cause = cause
+
+    def toString(self):
+        return self._string
+
+    def getException(self):
+        return self._exception_code
+
+    def getCause(self):
+        return self._cause
+
+
+class _Transfer:
+    """Stands in for a TMTCLib transfer"""
+
+    def __init__(self, in_progress=True, error=0):
+        self._in_progress = in_progress
+        self._error = error
+        self.aborted = False
+
+    def isInProgress(self):
+        return self._in_progress
+
+    def getError(self):
+        return self._error
+
+    def abort(self):
+        self.aborted = True
+
+
+class _CommandHandler:
+    """Stands in for the TMTCLib command handler
+
+    Transfers report each of transfer_states, (in progress, error) pairs,
+    to their listener before returning.
+
+    """
+
+    def __init__(self, error=None, transfer_states=(), downlink_data=b''):
+        self.error = error
+        self.calls = []
+        self.transfer_states = transfer_states
+        self.downlink_data = downlink_data
+        self.transfer = None
+
+    def getParameter(self, *args):
+        self.calls.append(args)
+        if self.error is not None:
+            raise self.error
+        if len(args) == 3:
+            return _Value(args[1])
+        # Range get: id, first row, last row, resize, timeout
+        return [_Value(row) for row in range(args[1], args[2] + 1)]
+
+    def _transfer(self, listener):
+        for in_progress, error in self.transfer_states:
+            listener.stateChanged(_Transfer(in_progress, error), None, '')
+        self.transfer = _Transfer()
+        return self.transfer
+
+    def setParameter(self, *args):
+        self.calls.append(args)
+
+    def uplinkParameter(self, filename, *args):
+        return self._transfer(args[-1])
+
+    def downlinkParameter(self, filename, *args):
+        # TMTCLib writes the downlinked rows to the file it is given
+        with open(filename, 'wb') as f:
+            f.write(self.downlink_data)
+        return self._transfer(args[-1])
+
+
+def _tmtc(test, model=None, command_handler=None):
+    """Build a connected TMTCPy4j without a gateway or space link"""
+    tmtc = TMTCPy4j.__new__(TMTCPy4j)
+    tmtc._command_handler = command_handler or _CommandHandler()
+    tmtc.model = model
+    tmtc.default_timeout = 1000
+    # java.io.File stands in as the path itself, ByteArray as bytes
+    tmtc._gw = types.SimpleNamespace(
+        jvm=types.SimpleNamespace(
+            java=types.SimpleNamespace(io=types.SimpleNamespace(File=str))),
+        j_util=types.SimpleNamespace(ByteArray=bytes),
+        to_java_list=list)
+    tmtc._transfer_tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmtc._transfer_tmp.cleanup)
+    tmtc._downlink_file_ids = itertools.count()
+    return tmtc
+
+
+class TestGet(unittest.TestCase):
+
+    def test_single_row(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()))
+        self.assertEqual(tmtc.get('p', 2, 2), 2)
+
+    def test_rows_resolve_parameter_once(self):
+        model = _Model(_parameter_instance())
+        tmtc = _tmtc(self, model)
+        self.assertEqual(tmtc.get('p'), [0, 1, 2, 3])
+        self.assertEqual(model.lookups, 1)
+        self.assertEqual(tmtc._command_handler.calls, [(9, 0, 3, True, 1000)])
+
+    def test_get_batch_single_row_is_a_list(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()))
+        self.assertEqual(tmtc.get_batch('p', 1, 1), [1])
+
+    def test_row_range_checked(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()))
+        with self.assertRaises(ValueError):
+            tmtc.get_batch('p', 3, 1)
+
+    def test_py4j_error_raised(self):
+        for get in (TMTCPy4j.get, TMTCPy4j.get_batch):
+            with self.subTest(get=get.__name__):
+                tmtc = _tmtc(self, _Model(_parameter_instance()),
+                             _CommandHandler(Py4JError('gateway closed')))
+                with self.assertLogs(level='ERROR') as logs, \
+                        self.assertRaises(Py4JError):
+                    get(tmtc, 'p', 0, 1)
+                self.assertEqual(
+                    logs.records[0].getMessage(), 'Py4JError gateway closed')
+
+class TestSetFixedRaw(unittest.TestCase):
+
+    def _tmtc(self, bytes_per_row):
+        return _tmtc(self, _Model(_parameter_instance(
+            TypeStr.raw, bytes_per_row=bytes_per_row)))
+
+    def test_row_of_expected_length(self):
+        # Lengths outside CPython's small int cache compare equal too
+        for bytes_per_row in (4, 300):
+            with self.subTest(bytes_per_row=bytes_per_row):
+                tmtc = self._tmtc(bytes_per_row)
+                row = bytes(bytes_per_row)
+                tmtc.set('p', [row, row])
+                self.assertEqual(tmtc._command_handler.calls,
+                                 [(9, 0, [row, row], False, 1000)])
+
+    def test_row_of_wrong_length(self):
+        for bytes_per_row in (4, 300):
+            with self.subTest(bytes_per_row=bytes_per_row):
+                tmtc = self._tmtc(bytes_per_row)
+                with self.assertRaises(TypeError) as raised:
+                    tmtc.set('p', [bytes(bytes_per_row + 1)])
+                self.assertIsInstance(raised.exception.__cause__, ValueError)
+                self.assertEqual(tmtc._command_handler.calls, [])
+
+    def test_int_row_padded(self):
+        tmtc = self._tmtc(4)
+        tmtc.set('p', 1)
+        self.assertEqual(tmtc._command_handler.calls,
+                         [(9, 0, [b'\0\0\0\1'], False, 1000)])
+
+
+class TestTransfer(unittest.TestCase):
+
+    def test_listener_records_first_error(self):
+        states = []
+        listener = _TransferListener(states.append)
+        listener.stateChanged(_Transfer(), None, 'started')
+        self.assertFalse(listener.completed.is_set())
+        # An error and then the transfer ending both report completion;
+        # the first status is the one kept
+        listener.stateChanged(_Transfer(True, 12), None, 'failed')
+        listener.stateChanged(_Transfer(False, 0), None, 'finished')
+        self.assertTrue(listener.completed.is_set())
+        self.assertEqual(listener.exception_code, 12)
+        self.assertEqual(states, ['started', 'failed', 'finished'])
+
+    def test_uplink(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()),
+                     _CommandHandler(transfer_states=[(False, 0)]))
+        self.assertIsNone(tmtc.uplink('p', b'\0' * 8))
+
+    def test_uplink_error(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()),
+                     _CommandHandler(transfer_states=[(True, 12), (False, 0)]))
+        with self.assertRaises(TMTCTransferError) as raised:
+            tmtc.uplink('p', b'\0' * 8)
+        self.assertIsInstance(raised.exception.__cause__, OBSWExceptionError)
+        self.assertEqual(raised.exception.__cause__.args[0], 12)
+
+    def test_uplink_timeout_aborts(self):
+        command_handler = _CommandHandler()
+        tmtc = _tmtc(self, _Model(_parameter_instance()), command_handler)
+        with self.assertRaisesRegex(TMTCTransferError, 'timed out'):
+            tmtc.uplink('p', b'\0' * 8, timeout=10)
+        self.assertTrue(command_handler.transfer.aborted)
+
+    def test_downlink(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()), _CommandHandler(
+            transfer_states=[(False, 0)], downlink_data=b'\1' * 16))
+        self.assertEqual(tmtc.downlink('p'), b'\1' * 16)
+
+    def test_downlink_error(self):
+        tmtc = _tmtc(self, _Model(_parameter_instance()), _CommandHandler(
+            transfer_states=[(True, 12), (False, 0)]))
+        with self.assertRaises(TMTCTransferError) as raised:
+            tmtc.downlink('p')
+        self.assertEqual(raised.exception.__cause__.args[0], 12)
+
+    def test_downlink_timeout_aborts(self):
+        command_handler = _CommandHandler()
+        tmtc = _tmtc(self, _Model(_parameter_instance()), command_handler)
+        with self.assertRaisesRegex(TMTCTransferError, 'timed out'):
+            tmtc.downlink('p', timeout=10)
+        self.assertTrue(command_handler.transfer.aborted)
+
+
+_CMD = 'com.brightascension.gen1.protocol.cmd.'
+_TRANSFER = 'com.brightascension.gen1.protocol.transfer.'
+
+
+class TestCommandException(unittest.TestCase):
+
+    def _get(self, java_exception):
+        """get() a parameter, failing with java_exception"""
+        tmtc = _tmtc(self, _Model(_parameter_instance()), _CommandHandler(
+            Py4JJavaError('', java_exception)))
+        tmtc.get('p', 0, 0)
+
+    def test_transfer_exception_detail(self):
+        # Only the first ': ' separates the class from the detail
+        with self.assertRaisesRegex(TMTCTransferError, '^CRC: row 3$'):
+            self._get(_JavaException(
+                _TRANSFER + 'TransferException: CRC: row 3'))
+
+    def test_command_exception_cause(self):
+        with self.assertLogs(level='ERROR'), \
+                self.assertRaises(TMTCCommandError) as raised:
+            self._get(_JavaException(
+                _CMD + 'CommandException: Timed out',
+                cause=_JavaException('java.io.IOException: Refused')))
+        self.assertEqual(
+            str(raised.exception),
+            'Command failed (Timed out: Refused). '
+            'OBSW instance may not be reachable.')
+
+    def test_without_detail(self):
+        with self.assertLogs(level='ERROR'), \
+                self.assertRaises(TMTCCommandError) as raised:
+            self._get(_JavaException(_CMD + 'CommandException'))
+        self.assertEqual(
+            str(raised.exception),
+            'Command failed (: ). OBSW instance may not be reachable.')
+
+        with self.assertRaisesRegex(TMTCTransferError, '^$'):
+            self._get(_JavaException(_TRANSFER + 'TransferException'))
+
+
+    def test_sync_command_exception_nack(self):
+        for string in (_CMD + 'SyncCommandException: NACK',
+                       _CMD + 'SyncCommandException'):
+            with self.subTest(string=string):
+                with self.assertRaises(OBSWExceptionError) as raised:
+                    self._get(_JavaException(string, exception_code=12))
+                self.assertEqual(
+                    raised.exception.args,
+                    (12, 'sys.core.C.error', 'Something went wrong'))
+
+    def test_dispatch_on_exact_class(self):
+        # A class whose name merely starts with a known one is not handled
+        # as that class; the Java error is raised as it is
+        error = Py4JJavaError('', _JavaException(
+            _CMD + 'CommandExceptionHandlerError: failed'))
+        tmtc = _tmtc(self, _Model(_parameter_instance()),
+                     _CommandHandler(error))
+        with self.assertLogs(level='ERROR'), \
+                self.assertRaises(Py4JJavaError) as raised:
+            tmtc.get('p', 0, 0)
+        self.assertIs(raised.exception, error)
+
+
+class TestOutputRingBuffer(unittest.TestCase):
+
+    def test_drain_oldest_first(self):
+        buffer = _OutputRingBuffer(max_chars=100)
+        buffer.write('one\n')
+        buffer.write('two\n')
+        self.assertEqual(buffer.drain(), 'one\ntwo\n')
+        self.assertEqual(buffer.drain(), '')
+
+    def test_keeps_most_recent_within_limit(self):
+        buffer = _OutputRingBuffer(max_chars=8)
+        for line in ('aaa\n', 'bbb\n', 'ccc\n'):
+            buffer.write(line)
+        self.assertEqual(buffer.drain(), 'bbb\nccc\n')
+
+    def test_keeps_last_line_over_limit(self):
+        buffer = _OutputRingBuffer(max_chars=8)
+        buffer.write('aaa\n')
+        buffer.write('a line longer than the limit\n')
+        self.assertEqual(buffer.drain(), 'a line longer than the limit\n')
+
+    def test_limit_reset_by_drain(self):
+        buffer = _OutputRingBuffer(max_chars=8)
+        buffer.write('aaa\n')
+        buffer.write('bbb\n')
+        buffer.drain()
+        buffer.write('ccc\n')
+        buffer.write('ddd\n')
+        self.assertEqual(buffer.drain(), 'ccc\nddd\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,20 +18,28 @@ __author__ = 'Alex Mason'
 __copyright__ = 'Copyright (c) Bright Ascension Ltd, 2018'
 
 import functools
+import itertools
 import logging
 import os
 import queue
 import struct
 import tempfile
-from builtins import property
-from collections import deque, Iterable
+import threading
+import weakref
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields, replace
 from enum import Enum
-from typing import Union, NamedTuple, List, Callable
+from typing import Union, NamedTuple, List, Tuple, Callable
 
 from py4j.java_collections import ListConverter
 from py4j.java_gateway import JavaGateway, JavaObject, CallbackServerParameters
 from py4j.protocol import Py4JError, Py4JJavaError
 
+# Precompiled codecs for float parameter values, keyed on bytes per row
+_float_structs = {4: struct.Struct('f'), 8: struct.Struct('d')}
+
 
 # Exceptions used by this module.
 class TMTCServerError(OSError):
@@ -82,6 +90,38 @@ class OBSWExceptionError(RuntimeError):
     """Raised when an exception code is returned by an on-board function"""
 
 
+class _OutputRingBuffer:
+    """File-like sink that keeps only the most recent output written to it
+
+    Used to capture JVM stdout/stderr for debugging. Memory is bounded by
+    the number of characters held rather than the number of lines, so a
+    burst of very long log lines can't grow it without limit.
+
+    """
+
+    def __init__(self, max_chars=1 << 16):
+        self._max_chars = max_chars
+        self._lines = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def write(self, line: str):
+        """Called from the Py4J output consumer thread for each line"""
+        with self._lock:
+            self._lines.append(line)
+            self._size += len(line)
+            while self._size > self._max_chars and len(self._lines) > 1:
+                self._size -= len(self._lines.popleft())
+
+    def drain(self) -> str:
+        """Remove and return the buffered output, oldest first"""
+        with self._lock:
+            output = ''.join(self._lines)
+            self._lines.clear()
+            self._size = 0
+        return output
+
+
 class Py4JConnection:
     """Wrapper class for handling the Py4J gateway to the TMTCLib Java API
 
@@ -95,6 +135,9 @@ class Py4JConnection:
     the JVM.
 
     """
+    __slots__ = (
+        '_classpath', '_javaopts', '_gw', '_jvm_stdout', '_jvm_stderr',
+        '_j_protocol', '_j_model', '_j_util')
 
     def __init__(self, classpath, javaopts=None):
         """
@@ -108,25 +151,32 @@ class Py4JConnection:
         self._classpath = classpath
         self._javaopts = javaopts
 
-        self._gw, self._jvm_stderr, self._jvm_stdout = self.launch(
+        self._gw, self._jvm_stdout, self._jvm_stderr = self.launch(
             classpath,
             javaopts)
 
+        # Resolve the package views once; each dotted step of a jvm view
+        # is a round trip to the JVM
+        gen1 = self._gw.jvm.com.brightascension.gen1
+        self._j_protocol = gen1.protocol
+        self._j_model = gen1.model
+        self._j_util = gen1.util
+
     @property
     def jvm(self):
         return self._gw.jvm
 
     @property
     def j_protocol(self):
-        return self._gw.jvm.com.brightascension.gen1.protocol
+        return self._j_protocol
 
     @property
     def j_model(self):
-        return self._gw.jvm.com.brightascension.gen1.model
+        return self._j_model
 
     @property
     def j_util(self):
-        return self._gw.jvm.com.brightascension.gen1.util
+        return self._j_util
 
     @property
     def gateway_client(self):
@@ -162,8 +212,8 @@ class Py4JConnection:
             javaopts = []
 
         # Circular buffers to capture most recent java side output for debug
-        jvm_stderr = deque(maxlen=512)
-        jvm_stdout = deque(maxlen=512)
+        jvm_stderr = _OutputRingBuffer()
+        jvm_stdout = _OutputRingBuffer()
 
         gw = JavaGateway.launch_gateway(
             classpath=classpath,
@@ -186,32 +236,73 @@ class Py4JConnection:
 
     def drain_jvm_stderr(self):
         """Debug function, prints most recent JVM stderr"""
-        try:
-            for line in iter(self._jvm_stderr.pop, None):
-                print(line, end='')  # newline already in str
-        except IndexError:
-            # Swallow error
-            pass
+        print(self._jvm_stderr.drain(), end='')  # newlines already in str
 
     def drain_jvm_stdout(self):
         """Debug function, prints most recent JVM stdout"""
-        try:
-            for line in iter(self._jvm_stdout.pop, None):
-                print(line, end='')  # newline already in str
-        except IndexError:
-            # Swallow error
-            pass
+        print(self._jvm_stdout.drain(), end='')  # newlines already in str
 
 
 ##
 # Model inspection types used in this module
-# When we move to support python >= 3.7 these should be upgraded
-# to dataclasses
+#
+# These are frozen dataclasses with __slots__: many thousands of them are
+# created when walking a deployment, and slots keep each instance small
+# and attribute access cheap
 ##
 
-Documentation = NamedTuple('Documentation', [('text', str), ('html', str)])
-Documentation.text.__doc__ = 'Documentation as plain text'
-Documentation.html.__doc__ = 'Documentation as html'
+
+class _ModelType:
+    """Base of the model inspection types
+
+    Frozen dataclasses with __slots__ can't be copied or pickled by default
+    (restoring the slots trips the frozen __setattr__), so save and restore
+    the field values directly.
+
+    These types used to be NamedTuples. Unpacking, indexing, len(),
+    _fields, _asdict() and _replace() still work as they did; comparing
+    with a plain tuple no longer does.
+
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(self)
+
+    def __setstate__(self, state):
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+    def __iter__(self):
+        return (getattr(self, field.name) for field in fields(self))
+
+    def __len__(self):
+        return len(fields(self))
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    @property
+    def _fields(self) -> tuple:
+        return tuple(field.name for field in fields(self))
+
+    def _asdict(self) -> dict:
+        # Shallow, like NamedTuple._asdict(); dataclasses.asdict() recurses
+        return {field.name: getattr(self, field.name)
+                for field in fields(self)}
+
+    def _replace(self, **changes):
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True)
+class Documentation(_ModelType):
+    """Documentation attached to an element of the model"""
+    __slots__ = ('text', 'html')
+
+    text: str  # Documentation as plain text
+    html: str  # Documentation as html
+
 
 # noinspection SpellCheckingInspection
 _type_strings = [
@@ -241,120 +332,253 @@ ParameterSize.__doc__ = 'Describes the dimensions of a parameter'
 ParameterSize.size.__doc__ = 'the overall size (in bytes) of the parameter'
 ParameterSize.length.__doc__ = 'the length (number of rows) of the parameter'
 
-_element_attrs = [
-    ('id', int),
-    ('name', str),
-    ('full_name', str),
-    ('description', str),
-    ('documentation', Documentation),
-    ('index', int)
-]  # Common attributes for elements present in the model
-
-_argument_attrs = [
-    ('signature', str),
-    ('min_bytes', int),
-    ('max_bytes', int),
-    ('type_class', ArgumentTypeClass),
-    ('is_fixed_size', bool)]
-Argument = NamedTuple(
-    'Argument', _element_attrs + _argument_attrs)
-Argument.__doc__ += ': Description of an argument to an action'
-
-_action_definition_attrs = [
-    ('signature', str),
-    ('arguments', List[Argument])]
-ActionDefinition = NamedTuple('ActionDefinition', _action_definition_attrs)
-ActionDefinition.__doc__ += ": Description of an action's type"
-ActionInstance = NamedTuple(
-    'ActionInstance', _element_attrs + [('definition', ActionDefinition)])
-ActionInstance.__doc__ += ''
-': Description of an instance of an action within a deployment'
-
-_parameter_definition_attrs = [
-    ('signature', str),
-    ('type_str', TypeStr),
-    ('type_class', TypeClass),
-    ('min_rows', int),
-    ('max_rows', int),
-    ('bits_per_row', int),
-    ('bytes_per_row', int),
-    ('storage_bytes_per_row', int),
-    ('unused_bits_per_row', int),
-    ('is_raw', bool),
-    ('is_fixed_size', bool),
-    ('is_read_only', bool),
-    ('is_config', bool),
-]
-ParameterDefinition = NamedTuple(
-    'ParameterDefinition',
-    _parameter_definition_attrs)
-ParameterDefinition.__doc__ += ""
-": Description of a parameter in terms of it's type"
-ParameterInstance = NamedTuple(
-    'ParameterInstance', _element_attrs + [('definition', ParameterDefinition)])
-ParameterInstance.__doc__ += ''
-': Description of an instance of a parameter within a deployment'
-
-ParameterBlockInstance = NamedTuple(
-    'ParameterBlockInstance',
-    _element_attrs + [('definition', ParameterDefinition)])
-ParameterBlockInstance.__doc__ += ''
-': Description of an instance of a parameter block within a deployment'
-
-_event_definition_attrs = [
-    ('signature', str),
-    ('severity', str),
-]
-EventDefinition = NamedTuple(
-    'EventDefinition',
-    _event_definition_attrs)
-EventDefinition.__doc__ += ": Description of an event"
-EventInstance = NamedTuple(
-    'EventInstance',
-    _element_attrs + [('definition', EventDefinition)])
-EventInstance.__doc__ += ''
-': Description of an instance of an event within a deployment'
-
-_event_source_definition_attrs = [
-    ('signature', str),
-]
-EventSourceDefinition = NamedTuple('EventSourceDefinition',
-                                   _event_source_definition_attrs)
-EventSourceDefinition.__doc__ += ": Description of an event source"
-EventSourceInstance = NamedTuple(
-    'EventSourceInstance',
-    _element_attrs + [('definition', EventSourceDefinition)])
-EventSourceInstance.__doc__ += ''
-': Description of an instance of an event source within a deployment'
-
-OnboardException = NamedTuple('OnboardException', _element_attrs)
-
-_component_attrs = [
-    ('signature', str),
-    ('actions', List[ActionInstance]),
-    ('parameters', List[ParameterInstance]),
-    ('events', List[EventInstance]),
-    ('event_sources', List[EventSourceInstance]),
-    ('exceptions', List[OnboardException])
-]
-ComponentInstance = NamedTuple(
-    'ComponentInstance', _element_attrs + _component_attrs)
-
-_component_group_attrs = [
-    ('signature', str),
-    ('components', List[ComponentInstance]),
-    ('component_groups', List['ComponentGroup'])]
-ComponentGroup = NamedTuple(
-    'ComponentGroup', _element_attrs + _component_group_attrs)
-
-_deployment_attrs = [
-    ('name', str),
-    ('description', str),
-    ('documentation', Documentation),
-    ('components', List[ComponentInstance]),
-    ('component_groups', List['ComponentGroup'])]
-DeploymentInstance = NamedTuple(
-    'DeploymentInstance', _deployment_attrs)
+
+@dataclass(frozen=True)
+class _Element(_ModelType):
+    """Common attributes for elements present in the model"""
+    __slots__ = (
+        'id', 'name', 'full_name', 'description', 'documentation', 'index')
+
+    id: int
+    name: str
+    full_name: str
+    description: str
+    documentation: Documentation
+    index: int
+
+
+@dataclass(frozen=True)
+class Argument(_Element):
+    """Description of an argument to an action"""
+    __slots__ = (
+        'signature', 'min_bytes', 'max_bytes', 'type_class', 'is_fixed_size')
+
+    signature: str
+    min_bytes: int
+    max_bytes: int
+    type_class: ArgumentTypeClass
+    is_fixed_size: bool
+
+
+@dataclass(frozen=True)
+class ActionDefinition(_ModelType):
+    """Description of an action's type"""
+    __slots__ = ('signature', 'arguments')
+
+    signature: str
+    arguments: Tuple[Argument, ...]
+
+
+@dataclass(frozen=True)
+class ActionInstance(_Element):
+    """Description of an instance of an action within a deployment"""
+    __slots__ = ('definition',)
+
+    definition: ActionDefinition
+
+
+@dataclass(frozen=True)
+class ParameterDefinition(_ModelType):
+    """Description of a parameter in terms of it's type"""
+    __slots__ = (
+        'signature', 'type_str', 'type_class', 'min_rows', 'max_rows',
+        'bits_per_row', 'bytes_per_row', 'storage_bytes_per_row',
+        'unused_bits_per_row', 'is_raw', 'is_fixed_size', 'is_read_only',
+        'is_config')
+
+    signature: str
+    type_str: TypeStr
+    type_class: TypeClass
+    min_rows: int
+    max_rows: int
+    bits_per_row: int
+    bytes_per_row: int
+    storage_bytes_per_row: int
+    unused_bits_per_row: int
+    is_raw: bool
+    is_fixed_size: bool
+    is_read_only: bool
+    is_config: bool
+
+
+@dataclass(frozen=True)
+class ParameterInstance(_Element):
+    """Description of an instance of a parameter within a deployment"""
+    __slots__ = ('definition',)
+
+    definition: ParameterDefinition
+
+
+@dataclass(frozen=True)
+class ParameterBlockInstance(_Element):
+    """Description of an instance of a parameter block within a deployment"""
+    __slots__ = ('definition',)
+
+    definition: ParameterDefinition
+
+
+# We have to use a dummy definition for parameters within blocks, as the
+# model contains no information on them
+_parameter_block_parameter_definition = ParameterDefinition(
+    signature='',
+    type_str=TypeStr.raw,
+    type_class=TypeClass.var_vector,
+    min_rows=1,
+    max_rows=65535,
+    bits_per_row=8,
+    bytes_per_row=1,
+    storage_bytes_per_row=1,
+    unused_bits_per_row=0,
+    is_raw=True,
+    is_fixed_size=False,
+    is_read_only=False,
+    is_config=False
+)
+
+
+@dataclass(frozen=True)
+class EventDefinition(_ModelType):
+    """Description of an event"""
+    __slots__ = ('signature', 'severity')
+
+    signature: str
+    severity: str
+
+
+# EventDefinition severities, keyed on the SCDB's event severity mask
+_severity_masks = {0x0000: 'info',
+                   0x4000: 'error',
+                   0x8000: 'component_fatal',
+                   0xC000: 'system_fatal'}
+
+
+@dataclass(frozen=True)
+class EventInstance(_Element):
+    """Description of an instance of an event within a deployment"""
+    __slots__ = ('definition',)
+
+    definition: EventDefinition
+
+
+@dataclass(frozen=True)
+class EventSourceDefinition(_ModelType):
+    """Description of an event source"""
+    __slots__ = ('signature',)
+
+    signature: str
+
+
+@dataclass(frozen=True)
+class EventSourceInstance(_Element):
+    """Description of an instance of an event source within a deployment"""
+    __slots__ = ('definition',)
+
+    definition: EventSourceDefinition
+
+
+@dataclass(frozen=True)
+class OnboardException(_Element):
+    """Description of an onboard exception"""
+    __slots__ = ()
+
+
+@dataclass(frozen=True)
+class _LazyElement(_Element):
+    """Element whose child elements are fetched on first access
+
+    Elements built by ModelInspector are created through _lazy(), which
+    leaves the child fields unset and keeps a factory returning one future
+    per child field. The first read of any child field fills in all of them
+    as tuples and drops the factory, so equality, repr and asdict() see
+    ordinary field values. Elements constructed directly take their child
+    elements as ordinary fields.
+
+    """
+    __slots__ = ('_fetch_children',)
+
+    _child_fields = ()
+
+    @classmethod
+    def _lazy(cls, fetch_children: Callable[[], List[Future]], **kwargs):
+        self = object.__new__(cls)
+        for name, value in kwargs.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_fetch_children', fetch_children)
+        return self
+
+    def __getattr__(self, name):
+        # Only reached when a slot is unset, i.e. before the children of a
+        # lazily built element have been fetched
+        if name not in self._child_fields:
+            raise AttributeError(name)
+        try:
+            fetch_children = object.__getattribute__(self, '_fetch_children')
+        except AttributeError:
+            raise AttributeError(name) from None
+
+        futures = fetch_children()
+        for field_name, future in zip(self._child_fields, futures):
+            object.__setattr__(self, field_name, future.result())
+        # Another thread may have fetched and dropped the factory already
+        try:
+            object.__delattr__(self, '_fetch_children')
+        except AttributeError:
+            pass
+        return object.__getattribute__(self, name)
+
+
+@dataclass(frozen=True)
+class ComponentInstance(_LazyElement):
+    """Description of an instance of a component within a deployment
+
+    The actions, parameters, events, event sources and exceptions of the
+    component are only looked up when first accessed.
+
+    """
+    __slots__ = (
+        'signature', 'actions', 'parameters', 'events', 'event_sources',
+        'exceptions')
+
+    _child_fields = (
+        'actions', 'parameters', 'events', 'event_sources', 'exceptions')
+
+    signature: str
+    actions: Tuple[ActionInstance, ...]
+    parameters: Tuple[ParameterInstance, ...]
+    events: Tuple[EventInstance, ...]
+    event_sources: Tuple[EventSourceInstance, ...]
+    exceptions: Tuple[OnboardException, ...]
+
+
+@dataclass(frozen=True)
+class ComponentGroup(_LazyElement):
+    """Description of a component group within a deployment
+
+    The component instances and sub groups of the group are only looked up
+    when first accessed.
+
+    """
+    __slots__ = ('signature', 'components', 'component_groups')
+
+    _child_fields = ('components', 'component_groups')
+
+    signature: str
+    components: Tuple[ComponentInstance, ...]
+    component_groups: Tuple['ComponentGroup', ...]
+
+
+@dataclass(frozen=True)
+class DeploymentInstance(_ModelType):
+    """Description of a deployment"""
+    __slots__ = (
+        'name', 'description', 'documentation', 'components',
+        'component_groups')
+
+    name: str
+    description: str
+    documentation: Documentation
+    components: List[ComponentInstance]
+    component_groups: List[ComponentGroup]
 
 
 def _element_fac(python_cls, java_element: JavaObject, id_: int, **kwargs):
@@ -372,38 +596,36 @@ def _element_fac(python_cls, java_element: JavaObject, id_: int, **kwargs):
         **kwargs)
 
 
-def _lookup_tree_get_id(d):
-    """Used once we have an unambiguous name sequence
-       Recurse down dictionaries until we get to the parameter ID
-       """
-    # todo: this is convoluted- consider reimplementing with a trie
-    try:
-        next_dict = d[list(d.keys())[0]]
-        return _lookup_tree_get_id(next_dict)
-    except (TypeError, AttributeError):
-        # Not a dictionary, we have reached the parameter ID
-        param_id = d
-        return param_id
-
-
-def _lookup_tree_get(tree, keys):
-    try:
-        return functools.reduce(dict.get, keys.split('.')[::-1], tree)
-    except TypeError:
-        return None
+_NameLookupTables = NamedTuple(
+    '_NameLookupTables', [('full_names', dict), ('suffixes', dict)])
+_NameLookupTables.__doc__ = 'Name lookup tables for a collection of elements'
+_NameLookupTables.full_names.__doc__ = 'full name -> id, for every element'
+_NameLookupTables.suffixes.__doc__ = \
+    'dotted suffix -> list of ids, see _lookup_tree_put'
 
 
-def _lookup_tree_put(tree, keys, value):
-    if '.' in keys:
-        key, rest = keys.split(".", 1)
+def _lookup_tree_put(tree, full_name, value):
+    """Index value under every dotted suffix of full_name
 
-        if key not in tree:
-            tree[key] = {}
+    The tree is a flat dict, e.g. 'platform.DummySubsys1.dummyParam32' is
+    reachable as 'dummyParam32', 'DummySubsys1.dummyParam32' and the full
+    name itself, so a partial name lookup is a single dict access.
+    """
+    suffix = full_name
+    while True:
+        tree.setdefault(suffix, []).append(value)
+        dot = suffix.find('.')
+        if dot < 0:
+            break
+        suffix = suffix[dot + 1:]
 
-        _lookup_tree_put(tree[key], rest, value)
 
-    else:
-        tree[keys] = value
+# Used by every ModelInspector to fetch component and component group
+# children concurrently. Children are created with their own children
+# unfetched, so workers never wait on each other. Shared at module level so
+# the number of threads stays bounded however many inspectors are created;
+# threads are only started once children are first fetched.
+_model_executor = ThreadPoolExecutor(max_workers=5)
 
 
 def _requires_scdb(method):
@@ -411,14 +633,81 @@ def _requires_scdb(method):
 
     @functools.wraps(method)
     def wrapper(self, *method_args, **method_kwargs):
-        if hasattr(self, 'j_deployment_instance') and \
-                self.j_deployment_instance:
+        if self.j_deployment_instance is not None:
             return method(self, *method_args, **method_kwargs)
         raise TMTCModelQueryError("Spacecraft Database file not loaded")
 
     return wrapper
 
 
+def _memoized(method):
+    """Decorator: cache the results of a model lookup on the inspector
+
+    The spacecraft database doesn't change once loaded, so repeated lookups
+    can be answered without crossing the Py4J boundary again. The cache is
+    cleared whenever a new SCDB is loaded.
+
+    Apply this outside _requires_scdb: a cached result implies the SCDB is
+    loaded, so cache hits skip that check.
+
+    Cached results are shared by every caller making the same lookup, so
+    the child elements they hold (an action's arguments, a component's
+    actions, ...) are tuples rather than lists that could be changed in
+    place.
+
+    Lookups run on _model_executor threads as well as the caller's, all
+    sharing the cache without a lock. That relies on the GIL making a single
+    dict get or set atomic: two threads missing on the same key both do the
+    lookup and the last store wins, which costs time but not correctness as
+    the results are equal.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *method_args, **method_kwargs):
+        key = (method.__name__,
+               method_args,
+               tuple(sorted(method_kwargs.items())))
+        try:
+            return self._lookup_cache[key]
+        except KeyError:
+            result = method(self, *method_args, **method_kwargs)
+            self._lookup_cache[key] = result
+            return result
+
+    return wrapper
+
+
+class _NameLookupTree:
+    """ModelInspector attribute: a name lookup tree built on first access
+
+    The tree for a collection is only built when a name in that collection
+    is first looked up, and kept in the inspector's '_' prefixed slot of the
+    same name. Clearing that slot (set it to None) discards the tree.
+
+    """
+    __slots__ = ('_j_items_attr', '_slot')
+
+    def __init__(self, j_items_attr: str):
+        self._j_items_attr = j_items_attr
+        self._slot = None
+
+    def __set_name__(self, owner, name):
+        self._slot = '_' + name
+
+    def __get__(self, inspector, owner=None):
+        if inspector is None:
+            return self
+        tree = getattr(inspector, self._slot)
+        if tree is None:
+            tree = inspector._init_name_lookup_tree(
+                getattr(inspector, self._j_items_attr))
+            setattr(inspector, self._slot, tree)
+        return tree
+
+    def __set__(self, inspector, tree):
+        setattr(inspector, self._slot, tree)
+
+
 class ModelInspector:
     """Class used to query the details of a deployment's spacecraft database
 
@@ -426,6 +715,42 @@ class ModelInspector:
     Instead, create a TMTCPy4j instance and use its 'model' attribute.
 
     """
+    __slots__ = (
+        '_gw',
+        'j_model',
+        'j_deployment_instance',
+        '_j_actions',
+        '_j_components',
+        '_j_component_groups',
+        '_j_events',
+        '_j_event_sources',
+        '_j_exceptions',
+        '_j_parameters',
+        '_j_parameter_blocks',
+        '_j_component_tree',
+        '_action_name_lookup_tree',
+        '_event_name_lookup_tree',
+        '_event_source_name_lookup_tree',
+        '_onboard_exception_name_lookup_tree',
+        '_component_name_lookup_tree',
+        '_component_group_name_lookup_tree',
+        '_parameter_name_lookup_tree',
+        '_parameter_block_name_lookup_tree',
+        '_argument_lookup_trees',
+        '_j_groups_by_id',
+        '_sub_group_ids',
+        '_j_variable_argument_class',
+        '_lookup_cache')
+
+    # Lookups for full and partial name matches (implemented on python side)
+    action_name_lookup_tree = _NameLookupTree('_j_actions')
+    event_name_lookup_tree = _NameLookupTree('_j_events')
+    event_source_name_lookup_tree = _NameLookupTree('_j_event_sources')
+    onboard_exception_name_lookup_tree = _NameLookupTree('_j_exceptions')
+    component_name_lookup_tree = _NameLookupTree('_j_components')
+    component_group_name_lookup_tree = _NameLookupTree('_j_component_groups')
+    parameter_name_lookup_tree = _NameLookupTree('_j_parameters')
+    parameter_block_name_lookup_tree = _NameLookupTree('_j_parameter_blocks')
 
     def __init__(self, gateway: Py4JConnection, scdb_filename: str):
         self._gw = gateway
@@ -433,19 +758,39 @@ class ModelInspector:
         # Java objects
         self.j_model = None
         self.j_deployment_instance = None
-
-        # Lookup trees for partial name matches (implemented on python side)
-        self.action_name_lookup_tree = None
-        self.event_name_lookup_tree = None
-        self.event_source_name_lookup_tree = None
-        self.onboard_exception_name_lookup_tree = None
-        self.component_name_lookup_tree = None
-        self.component_group_name_lookup_tree = None
-        self.parameter_name_lookup_tree = None
-        self.parameter_block_name_lookup_tree = None
+        self._j_variable_argument_class = \
+            gateway.j_model.type.ArgumentTypeClass.VARIABLE
+
+        # Handles to the deployment's element collections; fetched once when
+        # the SCDB is loaded rather than on every lookup
+        self._j_actions = None
+        self._j_components = None
+        self._j_component_groups = None
+        self._j_events = None
+        self._j_event_sources = None
+        self._j_exceptions = None
+        self._j_parameters = None
+        self._j_parameter_blocks = None
+        self._j_component_tree = None
+
+        # Lookup trees for partial name matches, see _NameLookupTree
+        self._clear_lookup_trees()
+
+        # Argument name lookup trees, built per action on first use
+        self._argument_lookup_trees = {}
+
+        # Component tree groups by component group id, and the ids of each
+        # group's sub-groups (deployment's top level groups under None),
+        # built on first use
+        self._j_groups_by_id = None
+        self._sub_group_ids = None
+
+        # Results of memoized lookups, see _memoized
+        self._lookup_cache = {}
 
         self.load_model_from_scdb(scdb_filename)
 
+    @_memoized
     @_requires_scdb
     def name_to_action_id(self, action_name: str) -> int:
         """Lookup an action's onboard id from a name
@@ -458,9 +803,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(action_name,
-                                self.j_deployment_instance.getActions(),
                                 self.action_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_component_id(self, component_name: str) -> int:
         """Lookup a component instances's onboard id from a name
@@ -475,9 +820,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(component_name,
-                                self.j_deployment_instance.getComponents(),
                                 self.component_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_component_group_id(self, component_group_name: str) -> int:
         """Lookup a component group's id from a name
@@ -493,9 +838,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(component_group_name,
-                                self.j_deployment_instance.getComponentGroups(),
                                 self.component_group_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_event_id(self, event_name: str) -> int:
         """Lookup an event's onboard id from a name
@@ -508,9 +853,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(event_name,
-                                self.j_deployment_instance.getEvents(),
                                 self.event_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_event_source_id(self, event_source_name: str) -> int:
         """Lookup an event source's onboard id from a name
@@ -523,9 +868,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(event_source_name,
-                                self.j_deployment_instance.getEventSources(),
                                 self.event_source_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_onboard_exception_id(self, onboard_exception: str) -> int:
         """Lookup an event source's onboard id from a name
@@ -538,9 +883,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(onboard_exception,
-                                self.j_deployment_instance.getExceptions(),
                                 self.onboard_exception_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_parameter_id(self, parameter_name: str) -> int:
         """Lookup a parameter's onboard id from a name
@@ -553,9 +898,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(parameter_name,
-                                self.j_deployment_instance.getParameters(),
                                 self.parameter_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def name_to_parameter_block_id(self, param_block_name: str) -> int:
         """Lookup a parameter block's onboard id from a name
@@ -568,9 +913,9 @@ class ModelInspector:
 
         """
         return self._name_to_id(param_block_name,
-                                self.j_deployment_instance.getParameterBlocks(),
                                 self.parameter_block_name_lookup_tree)
 
+    @_memoized
     @_requires_scdb
     def id_to_action_name(self, action_id: int) -> str:
         """ Lookup an action's name using it's onboard identifier
@@ -584,8 +929,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             action_id,
-            self.j_deployment_instance.getActions())
+            self._j_actions)
 
+    @_memoized
     @_requires_scdb
     def id_to_component_name(self, component_id: int) -> str:
         """ Lookup a component's name using it's onboard identifier
@@ -599,8 +945,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             component_id,
-            self.j_deployment_instance.getComponents())
+            self._j_components)
 
+    @_memoized
     @_requires_scdb
     def id_to_component_group_name(self, component_group_id: int) -> str:
         """ Lookup a component groups's name using it's identifier
@@ -617,8 +964,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             component_group_id,
-            self.j_deployment_instance.getComponentGroups())
+            self._j_component_groups)
 
+    @_memoized
     @_requires_scdb
     def id_to_event_name(self, event_id: int) -> str:
         """ Lookup an event's name using it's onboard identifier
@@ -632,8 +980,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             event_id,
-            self.j_deployment_instance.getEvents())
+            self._j_events)
 
+    @_memoized
     @_requires_scdb
     def id_to_event_source_name(self, event_source_id: int) -> str:
         """ Lookup an event source's name using it's onboard identifier
@@ -647,8 +996,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             event_source_id,
-            self.j_deployment_instance.getEventSources())
+            self._j_event_sources)
 
+    @_memoized
     @_requires_scdb
     def id_to_onboard_exception_name(self, exception_id: int) -> str:
         """ Lookup an onboard exception's name using it's onboard identifier
@@ -662,8 +1012,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             exception_id,
-            self.j_deployment_instance.getExceptions())
+            self._j_exceptions)
 
+    @_memoized
     @_requires_scdb
     def id_to_parameter_name(self, parameter_id: int) -> str:
         """ Lookup a parameter's name using it's onboard identifier
@@ -677,8 +1028,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             parameter_id,
-            self.j_deployment_instance.getParameters())
+            self._j_parameters)
 
+    @_memoized
     @_requires_scdb
     def id_to_parameter_block_name(self, parameter_block_id: int) -> str:
         """ Lookup a parameter block's name using it's onboard identifier
@@ -692,8 +1044,9 @@ class ModelInspector:
         """
         return self._id_to_name(
             parameter_block_id,
-            self.j_deployment_instance.getParameterBlocks())
+            self._j_parameter_blocks)
 
+    @_memoized
     @_requires_scdb
     def argument(
             self,
@@ -707,49 +1060,52 @@ class ModelInspector:
         :return: argument description or None if action takes no arguments
 
         """
-        if isinstance(action, str):
-            action = self.name_to_action_id(action)
-        if type(action) is not int:
-            raise TypeError(
-                'argument() requires action to be str or int')
+        action = self._coerce_to_id(
+            action, self.name_to_action_id,
+            'argument() requires action to be str or int')
 
-        if isinstance(argument, str):
-            j_arguments = self.j_deployment_instance.getActions().getById(
-                action).getType().getArguments()
+        j_arguments = self._j_actions.getById(action).getType().getArguments()
 
-            argument_name_lookup_tree = self._init_name_lookup_tree(j_arguments)
+        if isinstance(argument, str):
+            argument_name_lookup_tree = self._argument_lookup_trees.get(action)
+            if argument_name_lookup_tree is None:
+                argument_name_lookup_tree = \
+                    self._init_name_lookup_tree(j_arguments)
+                self._argument_lookup_trees[action] = \
+                    argument_name_lookup_tree
 
             argument = self._name_to_id(
-                argument, j_arguments, argument_name_lookup_tree)
+                argument, argument_name_lookup_tree)
 
-        if type(argument) is not int:
+        elif type(argument) is not int:
             raise TypeError(
                 'argument() requires argument_id to be str or int')
 
-        arg = self.j_deployment_instance.getActions().getById(
-            action).getType().getArguments().getById(argument)
+        return self._argument_from_j(j_arguments.getById(argument), argument)
 
+    def _argument_from_j(self, j_arg: JavaObject, argument: int):
+        """Create an Argument description from a java argument object"""
         try:
-            if arg.getArgumentClass() == \
-                    self._gw.j_model.type.ArgumentTypeClass.VARIABLE:
+            if j_arg.getArgumentClass() == self._j_variable_argument_class:
                 type_class = ArgumentTypeClass.variable
             else:
                 type_class = ArgumentTypeClass.fixed
 
             return _element_fac(
                 Argument,
-                arg,
+                j_arg,
                 argument,
-                **{'signature': arg.getSignature(),
-                   'max_bytes': arg.getMaxBytes(),
-                   'min_bytes': arg.getMinBytes(),
-                   'is_fixed_size': arg.isFixedSize(),
+                **{'signature': j_arg.getSignature(),
+                   'max_bytes': j_arg.getMaxBytes(),
+                   'min_bytes': j_arg.getMinBytes(),
+                   'is_fixed_size': j_arg.isFixedSize(),
                    'type_class': type_class})
 
         except AttributeError:
             # Argument was None
             return None
 
+    @_memoized
     @_requires_scdb
     def action_instance(self, action: Union[int, str]) -> ActionInstance:
         """Lookup an action instance and return details about its type
@@ -759,24 +1115,25 @@ class ModelInspector:
         :return: action description
 
         """
-        if isinstance(action, str):
-            action = self.name_to_action_id(action)
-        if type(action) is not int:
-            raise TypeError(
-                'action_instance(action) requires action to be str or int')
+        action = self._coerce_to_id(
+            action, self.name_to_action_id,
+            'action_instance(action) requires action to be str or int')
 
-        j_action_inst = self.j_deployment_instance.getActions().getById(action)
+        j_action_inst = self._j_actions.getById(action)
         if j_action_inst is None:
             raise TMTCModelQueryError(
                 'Action {} not present in deployment'.format(action))
 
         j_action_type = j_action_inst.getType()
 
-        args = []
-        j_args_iterator = j_action_type.getArguments().getAllById().iterator()
-        while j_args_iterator.hasNext():
-            j_arg = j_args_iterator.next()
-            args.append(self.argument(action, j_arg.getId()))
+        # Iterating the JavaIterator directly costs one next() call per
+        # element, rather than a hasNext() and a next(). Build each argument
+        # from the object we already hold rather than looking it up again
+        # through the action.
+        args = tuple(
+            self._argument_from_j(j_arg, j_arg.getId()) for
+            j_arg in
+            j_action_type.getArguments().getAllById().iterator())
 
         action_def = ActionDefinition(
             signature=j_action_type.getSignature(),
@@ -787,6 +1144,7 @@ class ModelInspector:
                             action,
                             **{'definition': action_def})
 
+    @_memoized
     @_requires_scdb
     def component_instance(
             self,
@@ -799,58 +1157,48 @@ class ModelInspector:
         :return: component instance description
 
         """
-        if isinstance(component_instance, str):
-            component_instance = self.name_to_component_id(component_instance)
-        if type(component_instance) is not int:
-            raise TypeError(
-                'component_instance(component_instance) '
-                'requires component_instance to be str or int')
+        component_instance = self._coerce_to_id(
+            component_instance, self.name_to_component_id,
+            'component_instance(component_instance) '
+            'requires component_instance to be str or int')
 
         j_component_inst = \
-            self.j_deployment_instance.getComponents().getById(
+            self._j_components.getById(
                 component_instance)
         if j_component_inst is None:
             raise TMTCModelQueryError(
                 'Component Instance {} not present in deployment'.format(
                     component_instance))
 
-        actions = [
-            self.action_instance(j_action.getId()) for
-            j_action in
-            j_component_inst.getActions().getAllById().iterator()]
-
-        parameters = [
-            self.parameter_instance(j_param.getId()) for
-            j_param in
-            j_component_inst.getParameters().getAllById().iterator()]
-
-        events = [
-            self.event_instance(j_event.getId()) for
-            j_event in
-            j_component_inst.getEvents().getAllById().iterator()]
-
-        event_sources = [
-            self.event_source_instance(j_event_source.getId()) for
-            j_event_source in
-            j_component_inst.getEventSources().getAllById().iterator()]
-
-        exceptions = [
-            self.onboard_exception(j_exception.getId()) for
-            j_exception in
-            j_component_inst.getExceptions().getAllById().iterator()]
+        def _instances(lookup, j_elements):
+            return tuple(lookup(j_element.getId()) for
+                         j_element in j_elements.getAllById().iterator())
+
+        def _children():
+            # Each child list is a long run of Py4J round-trips; the calls
+            # release the GIL while waiting on the socket so build them
+            # concurrently
+            return [
+                _model_executor.submit(_instances, lookup, j_elements) for
+                lookup, j_elements in [
+                    (self.action_instance, j_component_inst.getActions()),
+                    (self.parameter_instance,
+                     j_component_inst.getParameters()),
+                    (self.event_instance, j_component_inst.getEvents()),
+                    (self.event_source_instance,
+                     j_component_inst.getEventSources()),
+                    (self.onboard_exception,
+                     j_component_inst.getExceptions())]]
 
         return _element_fac(
-            ComponentInstance,
+            ComponentInstance._lazy,
             j_component_inst,
             component_instance,
             **{'signature': j_component_inst.getType().getSignature(),
-               'actions': actions,
-               'parameters': parameters,
-               'events': events,
-               'event_sources': event_sources,
-               'exceptions': exceptions,
+               'fetch_children': _children,
                })
 
+    @_memoized
     @_requires_scdb
     def component_group(
             self,
@@ -863,77 +1211,87 @@ class ModelInspector:
         :param component_group: name or identifier of component group to
             lookup
 
-        :return: component group details. Includes lists of component instances
-            and component sub groups.
+        :return: component group details. Includes tuples of component
+            instances and component sub groups.
 
         """
-        if isinstance(component_group, str):
-            component_group = self.name_to_component_group_id(component_group)
-        if type(component_group) is not int:
-            raise TypeError(
-                'component_group(component_group) '
-                'requires component_group to be str or int')
+        component_group = self._coerce_to_id(
+            component_group, self.name_to_component_group_id,
+            'component_group(component_group) '
+            'requires component_group to be str or int')
 
         j_component_group_inst = \
-            self.j_deployment_instance.getComponentGroups().getById(
+            self._j_component_groups.getById(
                 component_group)
         if j_component_group_inst is None:
             raise TMTCModelQueryError(
                 'Component Group {} not present in deployment'.format(
                     component_group))
 
-        def _get_group_for_component_group_inst_id(
-                j_groups_: JavaObject,
-                target_group_id: int):
+        # Index the deployment hierarchy on first use rather than walking
+        # it from the top for every group looked up
+        self._index_component_tree_groups()
 
-            j_groups_lst = [x for x in j_groups_.iterator()]
-            for j_group_ in j_groups_lst:
-                if j_group_.getComponentGroup().getId() == target_group_id:
-                    return j_group_
-                else:
-                    # Not at this level- recurse
-                    j_group_ = _get_group_for_component_group_inst_id(
-                        j_group_.getGroups(),
-                        target_group_id)
-
-                    if j_group_ is not None:
-                        # Keep searching at this level unless we found match
-                        return j_group_
-
-        # Walk deployment hierarchy until we reach our group
-        j_top_level_groups = \
-            self.j_deployment_instance.getComponentTree().getGroups()
-
-        j_group = _get_group_for_component_group_inst_id(
-            j_top_level_groups,
-            component_group)
+        j_group = self._j_groups_by_id.get(component_group)
+        if j_group is None:
+            raise TMTCModelQueryError(
+                'Component Group {} not present in component tree'.format(
+                    component_group))
 
-        # Reached our group:  fill out component instances and recurse into
-        # tree to fill out sub-groups. This is particularly inefficient, but
+        # Reached our group: component instances and sub-groups are filled
+        # out when first accessed. This is particularly inefficient, but
         # will do until we support the COAST model.
 
-        # get component instances
-        components = [
-            self.component_instance(j_component_inst.getId()) for
-            j_component_inst in
-            j_group.getComponents().iterator()]
+        def _components():
+            return tuple(
+                self.component_instance(j_component_inst.getId()) for
+                j_component_inst in
+                j_group.getComponents().iterator())
 
-        # get component groups
-        component_groups = [
-            self.component_group(j_group.getComponentGroup().getId()) for
-            j_group in
-            j_group.getGroups().iterator()
-        ]
+        def _component_groups():
+            return tuple(
+                self.component_group(sub_group_id) for
+                sub_group_id in self._sub_group_ids[component_group])
+
+        def _children():
+            return [_model_executor.submit(_components),
+                    _model_executor.submit(_component_groups)]
 
         return _element_fac(
-            ComponentGroup,
+            ComponentGroup._lazy,
             j_component_group_inst,
             component_group,
             **{'signature': j_component_group_inst.getType().getSignature(),
-               'components': components,
-               'component_groups': component_groups,
+               'fetch_children': _children,
                })
 
+    def _index_component_tree_groups(self):
+        """Map every group in the deployment's component tree by the id of
+        its component group, and record the sub-group ids of each group
+
+        Each group's id is fetched from Java once here, so listing sub-groups
+        afterwards needs no further round-trips.
+
+        """
+        if self._j_groups_by_id is not None:
+            return
+
+        j_groups_by_id = {}
+        sub_group_ids = {}
+
+        pending = [(None, self._j_component_tree)]
+        while pending:
+            parent_id, j_parent = pending.pop()
+            child_ids = sub_group_ids[parent_id] = []
+            for j_group in j_parent.getGroups().iterator():
+                group_id = j_group.getComponentGroup().getId()
+                child_ids.append(group_id)
+                j_groups_by_id[group_id] = j_group
+                pending.append((group_id, j_group))
+
+        self._sub_group_ids = sub_group_ids
+        self._j_groups_by_id = j_groups_by_id
+
     @_requires_scdb
     def deployment_instance(self) -> DeploymentInstance:
 
@@ -943,14 +1301,13 @@ class ModelInspector:
         components = [
             self.component_instance(j_component_inst.getId()) for
             j_component_inst in
-            j_depl.getComponentTree().getComponents().iterator()]
+            self._j_component_tree.getComponents().iterator()]
 
         # get component groups
+        self._index_component_tree_groups()
         component_groups = [
-            self.component_group(j_group.getComponentGroup().getId()) for
-            j_group in
-            j_depl.getComponentTree().getGroups().iterator()
-        ]
+            self.component_group(group_id) for
+            group_id in self._sub_group_ids[None]]
 
         return DeploymentInstance(
             name=j_depl.getName(),
@@ -962,6 +1319,7 @@ class ModelInspector:
             component_groups=component_groups
         )
 
+    @_memoized
     @_requires_scdb
     def event_instance(self, event: Union[int, str]) -> EventInstance:
         """Lookup an event instance and return details about its type
@@ -971,34 +1329,27 @@ class ModelInspector:
         :return: event description
 
         """
-        if isinstance(event, str):
-            event = self.name_to_event_id(event)
-        if type(event) is not int:
-            raise TypeError(
-                'event_instance(event) requires event to be str or int')
+        event = self._coerce_to_id(
+            event, self.name_to_event_id,
+            'event_instance(event) requires event to be str or int')
 
-        j_event_inst = self.j_deployment_instance.getEvents().getById(event)
+        j_event_inst = self._j_events.getById(event)
         if j_event_inst is None:
             raise TMTCModelQueryError(
                 'Event {} not present in deployment'.format(event))
 
         j_event_type = j_event_inst.getType()
 
-        severity_mask = j_event_type.getSeverityMask()
-        severity_masks = {0x0000: 'info',
-                          0x4000: 'error',
-                          0x8000: 'component_fatal',
-                          0xC000: 'system_fatal'}
-
         event_def = EventDefinition(
             signature=j_event_type.getSignature(),
-            severity=severity_masks[severity_mask])
+            severity=_severity_masks[j_event_type.getSeverityMask()])
 
         return _element_fac(EventInstance,
                             j_event_inst,
                             event,
                             **{'definition': event_def})
 
+    @_memoized
     @_requires_scdb
     def event_source_instance(
             self,
@@ -1011,15 +1362,13 @@ class ModelInspector:
         :return: event source description
 
         """
-        if isinstance(event_source, str):
-            event_source = self.name_to_event_source_id(event_source)
-        if type(event_source) is not int:
-            raise TypeError(
-                'event_source_instance(event_source) '
-                'requires event to be str or int')
+        event_source = self._coerce_to_id(
+            event_source, self.name_to_event_source_id,
+            'event_source_instance(event_source) '
+            'requires event to be str or int')
 
         j_event_source_inst = \
-            self.j_deployment_instance.getEventSources().getById(event_source)
+            self._j_event_sources.getById(event_source)
         if j_event_source_inst is None:
             raise TMTCModelQueryError(
                 'Event Source {} not present in deployment'.format(
@@ -1035,6 +1384,7 @@ class ModelInspector:
                             event_source,
                             **{'definition': event_source_def})
 
+    @_memoized
     @_requires_scdb
     def onboard_exception(
             self,
@@ -1047,15 +1397,12 @@ class ModelInspector:
         :return: onboard exception description
 
         """
-        if isinstance(onboard_exception, str):
-            onboard_exception = self.name_to_onboard_exception_id(
-                onboard_exception)
-        if type(onboard_exception) is not int:
-            raise TypeError(
-                'onboard_exception(onboard_exception) '
-                'requires onboard_exception to be str or int')
+        onboard_exception = self._coerce_to_id(
+            onboard_exception, self.name_to_onboard_exception_id,
+            'onboard_exception(onboard_exception) '
+            'requires onboard_exception to be str or int')
 
-        j_exception = self.j_deployment_instance.getExceptions().getById(
+        j_exception = self._j_exceptions.getById(
             onboard_exception)
         if j_exception is None:
             raise TMTCModelQueryError(
@@ -1066,6 +1413,7 @@ class ModelInspector:
                             j_exception,
                             onboard_exception)
 
+    @_memoized
     @_requires_scdb
     def parameter_instance(self,
                            parameter: Union[int, str]) -> ParameterInstance:
@@ -1077,14 +1425,12 @@ class ModelInspector:
 
         """
         # Convert parameter name to ID
-        if isinstance(parameter, str):
-            parameter = self.name_to_parameter_id(parameter)
-        if type(parameter) is not int:
-            raise TypeError(
-                'parameter_instance(parameter) '
-                'requires parameter to be str or int')
+        parameter = self._coerce_to_id(
+            parameter, self.name_to_parameter_id,
+            'parameter_instance(parameter) '
+            'requires parameter to be str or int')
 
-        j_param_inst = self.j_deployment_instance.getParameters().getById(
+        j_param_inst = self._j_parameters.getById(
             parameter)
         if j_param_inst is None:
             raise TMTCModelQueryError(
@@ -1116,6 +1462,7 @@ class ModelInspector:
                             parameter,
                             **{'definition': param_def})
 
+    @_memoized
     @_requires_scdb
     def parameter_instance_for_parameter_block(
             self,
@@ -1129,15 +1476,13 @@ class ModelInspector:
         :return: parameter type description
 
         """
-        if isinstance(parameter_block, str):
-            parameter_block = self.name_to_parameter_block_id(parameter_block)
-        if type(parameter_block) is not int:
-            raise TypeError(
-                'parameter_block_instance(parameter_block)'
-                'requires parameter_block to be str or int')
+        parameter_block = self._coerce_to_id(
+            parameter_block, self.name_to_parameter_block_id,
+            'parameter_block_instance(parameter_block) '
+            'requires parameter_block to be str or int')
 
         j_param_block_inst = \
-            self.j_deployment_instance.getParameterBlocks().getById(
+            self._j_parameter_blocks.getById(
                 parameter_block)
         if j_param_block_inst is None:
             raise TMTCModelQueryError(
@@ -1156,24 +1501,6 @@ class ModelInspector:
             definition=None
         )
 
-        # We have to create a dummy as the model contains no information
-        # on parameters within blocks
-        param_def = ParameterDefinition(
-            signature='',
-            type_str=TypeStr.raw,
-            type_class=TypeClass.var_vector,
-            min_rows=1,
-            max_rows=65535,
-            bits_per_row=8,
-            bytes_per_row=1,
-            storage_bytes_per_row=1,
-            unused_bits_per_row=0,
-            is_raw=True,
-            is_fixed_size=False,
-            is_read_only=False,
-            is_config=False
-        )
-
         param_inst = ParameterInstance(
             id=parameter_block + index_in_block,
             name=param_block_inst.name + str(index_in_block),
@@ -1183,7 +1510,7 @@ class ModelInspector:
                         ' parameter block',
             documentation=param_block_inst.documentation,
             index=index_in_block,
-            definition=param_def
+            definition=_parameter_block_parameter_definition
         )
 
         return param_inst
@@ -1191,11 +1518,16 @@ class ModelInspector:
     def load_model_from_scdb(self, scdb_path: str):
         """Load the spacecraft database from file
 
-        Passes filename of scdb to Java side to load and initialises the
-        instance name lookup trees
+        Passes filename of scdb to Java side to load. The instance name
+        lookup trees are built from it as they are first needed
 
         :param scdb_path: path to spacecraft database
         """
+        self._lookup_cache.clear()
+        self._argument_lookup_trees.clear()
+        self._j_groups_by_id = None
+        self._sub_group_ids = None
+
         self.j_model = \
             self._gw.j_model.Model(
                 self._gw.j_model.JarModelReader(
@@ -1205,106 +1537,83 @@ class ModelInspector:
                 self.j_model,
                 self.j_model.getDeployment(''))
 
-        self._initialise_lookup_trees()
-
-    def _initialise_lookup_trees(self):
-        # Construct python data structures with deployment element names
-        self.parameter_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getParameters())
-        self.parameter_block_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getParameterBlocks())
-        self.action_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getActions())
-        self.event_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getEvents())
-        self.event_source_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getEventSources())
-        self.onboard_exception_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getExceptions())
-        self.component_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getComponents())
-        self.component_group_name_lookup_tree = \
-            self._init_name_lookup_tree(
-                self.j_deployment_instance.getComponentGroups())
+        j_depl = self.j_deployment_instance
+        self._j_actions = j_depl.getActions()
+        self._j_components = j_depl.getComponents()
+        self._j_component_groups = j_depl.getComponentGroups()
+        self._j_events = j_depl.getEvents()
+        self._j_event_sources = j_depl.getEventSources()
+        self._j_exceptions = j_depl.getExceptions()
+        self._j_parameters = j_depl.getParameters()
+        self._j_parameter_blocks = j_depl.getParameterBlocks()
+        self._j_component_tree = j_depl.getComponentTree()
+
+        self._clear_lookup_trees()
+
+    def _clear_lookup_trees(self):
+        # Each tree is rebuilt from the deployment on its next access
+        self.action_name_lookup_tree = None
+        self.event_name_lookup_tree = None
+        self.event_source_name_lookup_tree = None
+        self.onboard_exception_name_lookup_tree = None
+        self.component_name_lookup_tree = None
+        self.component_group_name_lookup_tree = None
+        self.parameter_name_lookup_tree = None
+        self.parameter_block_name_lookup_tree = None
 
     @staticmethod
-    def _init_name_lookup_tree(j_deployment_items):
-        """ Construct tree for lookup of incomplete parameter names """
-        item_lookup_tree = {}
-
-        def name_and_id_tuple(j_item):
-            # Create tuple of items reversed full name and items ID
-            fully_qualified_name = j_item.getFullName()
-            reverse_fqn = '.'.join(fully_qualified_name.split('.')[::-1])
-            item_id = j_item.getId()
-            return reverse_fqn, item_id
+    def _init_name_lookup_tree(j_deployment_items) -> _NameLookupTables:
+        """ Construct tables for lookup of full and incomplete names """
+        full_names = {}
+        suffixes = {}
 
-        # Don't support 'dotted'  names (i.e. datapool params)
-        # This would be pretty complex to disambiguate from 'normal'
-        # parameter names
-        name_and_ids = [
-            name_and_id_tuple(j_item) for
-            j_item in j_deployment_items.getAllById().iterator()
-            if '.' not in j_item.getName()
-        ]
+        for j_item in j_deployment_items.getAllById().iterator():
+            full_name = j_item.getFullName()
+            item_id = j_item.getId()
+            full_names[full_name] = item_id
 
-        # Sort by name depth
-        name_and_ids.sort(key=lambda x: len(x[0].split('.')), reverse=True)
+            # Don't support partial 'dotted' names (i.e. datapool params)
+            # This would be pretty complex to disambiguate from 'normal'
+            # parameter names
+            if '.' not in j_item.getName():
+                _lookup_tree_put(suffixes, full_name, item_id)
 
-        for name_and_id in name_and_ids:
-            _lookup_tree_put(item_lookup_tree, name_and_id[0], name_and_id[1])
+        return _NameLookupTables(full_names, suffixes)
 
-        return item_lookup_tree
+    @staticmethod
+    def _coerce_to_id(element: Union[int, str],
+                      name_to_id: Callable[[str], int],
+                      type_error_message: str) -> int:
+        """Return element's id, looking it up with name_to_id if a name"""
+        if type(element) is int:
+            return element
+        if isinstance(element, str):
+            return name_to_id(element)
+        raise TypeError(type_error_message)
 
     @staticmethod
     def _name_to_id(name: str,
-                    instance_elements,
-                    name_lookup_tree) -> int:
+                    name_lookup_tree: _NameLookupTables) -> int:
 
         if not isinstance(name, str):
             raise TypeError('name must be a str')
 
-        try:
-            id_ = instance_elements.getByName(name).getId()
-        except AttributeError:
-            # element not found
-            id_ = None
-
-        if id_ is not None:
-            return id_
-        else:
-            return ModelInspector._partial_name_to_id(
-                name,
-                name_lookup_tree)
-
-    @staticmethod
-    def _partial_name_to_id(name: str, lookup_tree) -> int:
-
-        name_tree = _lookup_tree_get(lookup_tree, name)
+        # Both lookups are local, no round-trip to Java. An exact match
+        # always wins: 'dotted' names are left out of the suffix tree, so
+        # e.g. the full name 'core.C.d.p' (name 'd.p') would otherwise
+        # resolve to the suffix of 'sys.core.C.d.p'
+        item_id = name_lookup_tree.full_names.get(name)
+        if item_id is not None:
+            return item_id
 
-        try:
-            potential_matches = len(name_tree) if name_tree is not None else 0
-        except TypeError:
-            # Hit match immediately:
-            return name_tree
-
-        if potential_matches > 1:
-            raise TMTCModelQueryError(
-                'Name provided is ambiguous') from None
+        ids = name_lookup_tree.suffixes.get(name)
+        if ids is None:
+            raise TMTCModelQueryError('No matching name found')
 
-        elif potential_matches == 0:
-            # No match found, raise error
-            raise TMTCModelQueryError(
-                'No matching name found') from None
+        if len(ids) > 1:
+            raise TMTCModelQueryError('Name provided is ambiguous')
 
-        return _lookup_tree_get_id(name_tree)
+        return ids[0]
 
     @staticmethod
     def _id_to_name(id_: int, instance_elements) -> str:
@@ -1323,7 +1632,8 @@ class _TransferListener:
     """Implements the Java TransferListener interface
 
     Attributes:
-        completion_queue: Queue used to signal that the transfer is complete
+        completed: Event set once the transfer is complete
+        exception_code: error status code of the completed transfer
         state_changed_callback: Callable to be called when the transfer state
                                 has changed
         progress_callback: Callable to be called when the transfer progress
@@ -1342,9 +1652,11 @@ class _TransferListener:
         if self.state_changed_callback:
             self.state_changed_callback(stateDesc)
 
-        # Notify transfer has completed (enqueue error status code)
+        # Notify transfer has completed (record first error status code)
         if not transfer.isInProgress() or transfer.getError():
-            self.completion_queue.put(transfer.getError())
+            if not self.completed.is_set():
+                self.exception_code = transfer.getError()
+                self.completed.set()
 
     # ignore transfer parameter passed from Java
     # noinspection PyUnusedLocal,PyPep8Naming
@@ -1365,10 +1677,11 @@ class _TransferListener:
         implements = [
             'com.brightascension.gen1.protocol.transfer.TransferListener']
 
-    def __init__(self, completion_queue,
+    def __init__(self,
                  state_change_callback: Callable[[str], None] = None,
                  progress_callback: Callable[[int, int], None] = None):
-        self.completion_queue = completion_queue
+        self.completed = threading.Event()
+        self.exception_code = None
         self.state_changed_callback = state_change_callback
         self.progress_callback = progress_callback
 
@@ -1412,9 +1725,9 @@ class _TMListener:
 
         # Called asynchronously so we make a shallow copy snapshot here
         for listener in self.listeners.copy():
-            try:
+            if callable(listener):
                 listener(*args)
-            except TypeError:
+            else:
                 # Not a callable- enqueue data
                 listener.put_nowait(args)
 
@@ -1430,6 +1743,10 @@ class _TMListener:
     __isub__ = unregister
 
 
+# Event severities, indexed by the top two bits of a received event id
+_event_severities = ('info', 'error', 'component_fatal', 'system_fatal')
+
+
 class _EventListener(_TMListener):
     """Implements Java EventListener interface"""
 
@@ -1439,12 +1756,7 @@ class _EventListener(_TMListener):
         """Called from Java side when an onboard event is received"""
         event_id = event_id_with_severity & ~0xC000
 
-        event_severities = {0x0: 'info',
-                            0x1: 'error',
-                            0x2: 'component_fatal',
-                            0x3: 'system_fatal'}
-
-        severity = event_severities[event_id_with_severity >> 14]
+        severity = _event_severities[event_id_with_severity >> 14]
 
         self.notify(event_id, severity, source, info)
 
@@ -1543,7 +1855,7 @@ class TCPServer:
     def __str__(self):
         return 'TCPServer: port {}, {}'.format(
             self._port,
-            'Connected' if self._j_link else 'Not Connected')
+            'Connected' if self._j_link is not None else 'Not Connected')
 
 
 class TCPClient:
@@ -1608,10 +1920,10 @@ class TCPClient:
             self._j_link = None
 
     def __str__(self):
-        return 'TCPClient: host, {} port {}, {}'.format(
+        return 'TCPClient: host {}, port {}, {}'.format(
             self._host,
             self._port,
-            'Connected' if self._j_link else 'Not Connected')
+            'Connected' if self._j_link is not None else 'Not Connected')
 
 
 class UDP:
@@ -1683,11 +1995,11 @@ class UDP:
             self._j_link = None
 
     def __str__(self):
-        return 'UDP: host, {} dest port {}, source port {}, {}'.format(
+        return 'UDP: host {}, dest port {}, source port {}, {}'.format(
             self._host,
             self.destination_port,
             self.source_port,
-            'Connected' if self._j_link else 'Not Connected')
+            'Connected' if self._j_link is not None else 'Not Connected')
 
 
 class Serial:
@@ -1748,7 +2060,38 @@ class Serial:
     def __str__(self):
         return 'Serial: device {}, {}'.format(
             self._device,
-            'Connected' if self._j_link else 'Not Connected')
+            'Connected' if self._j_link is not None else 'Not Connected')
+
+
+def _transfer_tmp_parent():
+    """Directory to create transfer files in
+
+    Uplinked and downlinked data is passed to and from Java through files,
+    so prefer a tmpfs (RAM backed) location over disk where there is one.
+    Returns None (the platform's default temp directory) otherwise.
+
+    """
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def _disconnect_space_link(command_handler,
+                           obsw_connection,
+                           event_listener: _EventListener,
+                           debug_listener: _DebugListener,
+                           hk_listener: _HkListener):
+    """Detach the telemetry listeners and close the link to the OBSW
+
+    Module level, rather than a TMTCPy4j method, so that it can be used as a
+    finalizer without keeping the TMTCPy4j instance alive.
+
+    """
+    command_handler.removeEventListener(event_listener)
+    command_handler.removeDebugListener(debug_listener)
+    command_handler.removeHkListener(hk_listener)
+    obsw_connection.disconnect()
 
 
 def _requires_tmtc_connection(method):
@@ -1757,7 +2100,7 @@ def _requires_tmtc_connection(method):
 
     @functools.wraps(method)
     def wrapper(self, *method_args, **method_kwargs):
-        if hasattr(self, '_command_handler') and self._command_handler:
+        if self._command_handler is not None:
             return method(self, *method_args, **method_kwargs)
         raise TMTCDisconnected('please run connect() first')
 
@@ -1821,12 +2164,21 @@ class TMTCPy4j:
             telecommand
 
         """
+        # Set before anything that can raise, so the connection state is
+        # always defined
+        self._command_handler = None
+        # Disconnects the space link, when disconnect() is called or else
+        # when this instance is garbage collected
+        self._disconnect_finalizer = None
+
         self._gw = Py4JConnection(classpath)
 
         self._obsw_connection = obsw_connection
-        self._command_handler = None
 
-        self._transfer_tmp = tempfile.TemporaryDirectory()
+        self._transfer_tmp = tempfile.TemporaryDirectory(
+            dir=_transfer_tmp_parent())
+        # Names downlink files uniquely within _transfer_tmp
+        self._downlink_file_ids = itertools.count()
 
         self.event_listener = _EventListener()
         self.debug_listener = _DebugListener()
@@ -1909,6 +2261,75 @@ class TMTCPy4j:
         if timeout is None:
             timeout = self.default_timeout
 
+        parameter_instance, last_row, resize = self._resolve_get(
+            parameter, first_row, last_row, index_in_block, resize)
+
+        if first_row != last_row:
+            return self._get_rows(
+                parameter_instance, first_row, last_row, resize, timeout)
+
+        try:
+            j_object = self._command_handler.getParameter(
+                parameter_instance.id,
+                first_row,
+                timeout)
+
+            return self._from_gen1_type(j_object,
+                                        parameter_instance.definition)
+
+        except Py4JJavaError as e:
+            self.__handle_command_exception(e, 'Parameter get failed')
+
+        except Py4JError as e:
+            logging.error("Py4JError %s", e)
+            raise
+
+    @_requires_tmtc_connection
+    def get_batch(self,
+                  parameter: Union[str, int],
+                  first_row: int = 0,
+                  last_row: int = None,
+                  index_in_block=None,
+                  resize: bool = False,
+                  timeout: int = None) -> list:
+        """
+        Get the values of a range of parameter rows
+
+        Unlike get(), the rows are always returned as a list, even when the
+        range is a single row, so callers iterating over ranges don't need
+        to check what they got back.
+
+        :param parameter: name or id of parameter
+        :param first_row: index of the first row to get
+        :param last_row: index of the last row to get
+        :param index_in_block: index of parameter within parameter block to get
+        :param resize: true if this should be a resizing get
+            (Automatically adjust the last row requested if it is larger than
+            the amount of rows present)
+        :param timeout: if a response has not been received before this
+            time (in ms) an exception will be raised
+
+        :return: list of the row values. The type of each will be that of the
+            parameter as specified in the spacecraft database
+
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+
+        parameter_instance, last_row, resize = self._resolve_get(
+            parameter, first_row, last_row, index_in_block, resize)
+
+        return self._get_rows(
+            parameter_instance, first_row, last_row, resize, timeout)
+
+    def _resolve_get(self, parameter, first_row, last_row, index_in_block,
+                     resize):
+        """Look up the parameter instance to get and fill in the implied
+        row range
+
+        :return: (parameter instance, last row, resize) tuple
+
+        """
         if index_in_block is not None:
             # This is a request to get a parameter that belongs to a
             # parameter block; we need to create a dummy parameter
@@ -1920,41 +2341,36 @@ class TMTCPy4j:
         else:
             parameter_instance = self.model.parameter_instance(parameter)
 
-        param_def = parameter_instance.definition
-
         # Handle implied row ranges
         # Lookup parameter min/max rows
         if last_row is None:
-            last_row = param_def.max_rows - 1
+            last_row = parameter_instance.definition.max_rows - 1
             resize = True
         if first_row > last_row:
             raise ValueError('first_row cannot be greater than last_row')
 
-        try:
-            if first_row == last_row:
-                j_object = self._command_handler.getParameter(
-                    parameter_instance.id,
-                    first_row,
-                    timeout)
+        return parameter_instance, last_row, resize
 
-                return self._from_gen1_type(j_object, param_def)
-
-            else:
-                j_object_list = self._command_handler.getParameter(
-                    parameter_instance.id,
-                    first_row,
-                    last_row,
-                    resize,
-                    timeout)
+    def _get_rows(self, parameter_instance, first_row, last_row, resize,
+                  timeout) -> list:
+        """Get a range of rows of a resolved parameter instance"""
+        try:
+            j_object_list = self._command_handler.getParameter(
+                parameter_instance.id,
+                first_row,
+                last_row,
+                resize,
+                timeout)
 
-                return [self._from_gen1_type(j_object, param_def) for j_object
-                        in j_object_list]
+            decode = self._gen1_decoder(parameter_instance.definition)
+            return [decode(j_object) for j_object in j_object_list]
 
         except Py4JJavaError as e:
             self.__handle_command_exception(e, 'Parameter get failed')
 
         except Py4JError as e:
-            logging.error("Py4JError ", str(e))
+            logging.error("Py4JError %s", e)
+            raise
 
     @_requires_tmtc_connection
     def set(self,
@@ -2020,17 +2436,20 @@ class TMTCPy4j:
             # no type data present in model
             validate_len = False if index_in_block else True
 
-            data = [self._to_gen1_type(row,
-                                       param_inst.definition,
-                                       validate_len) for row in value]
+            to_gen1_type = self._to_gen1_type
+            definition = param_inst.definition
+            data = [to_gen1_type(row, definition, validate_len)
+                    for row in value]
 
         else:
             raise NotImplementedError('Unknown parameter TypeClass {}'.format(
                 str(param_inst.definition.type_class)))
 
         # convert data (list of bytes) to list of
-        # com.brightascension.gen1.util.ByteArray
-        j_byte_arrays = [self._gw.j_util.ByteArray(row) for row in data]
+        # com.brightascension.gen1.util.ByteArray. Resolve the class once:
+        # each lookup of a class on a jvm package view is a round trip
+        j_byte_array = self._gw.j_util.ByteArray
+        j_byte_arrays = [j_byte_array(row) for row in data]
         # to Java collection
         j_collection = self._gw.to_java_list(j_byte_arrays)
 
@@ -2172,20 +2591,18 @@ class TMTCPy4j:
 
         # We need to put the data to be uplinked into a file to pass to Java
 
-        with tempfile.NamedTemporaryFile('wb', delete=False) as f:
+        with tempfile.NamedTemporaryFile(
+                'wb', dir=self._transfer_tmp.name, delete=False) as f:
             tempfile_name = f.name
             f.write(data)
 
-        completion_q = queue.Queue(maxsize=1)
         transfer_listener = _TransferListener(
-            completion_q,
             state_change_callback,
             progress_callback)
 
         last_row = (first_row + len(
             data) // parameter_type.bytes_per_row) - 1
 
-        j_transfer = None
         try:
             j_transfer = self._command_handler.uplinkParameter(
                 tempfile_name,
@@ -2197,30 +2614,21 @@ class TMTCPy4j:
                 timeout,
                 transfer_listener)
 
-            exception_code = completion_q.get(timeout=timeout / 1000)
+            if not transfer_listener.completed.wait(timeout / 1000):
+                j_transfer.abort()
+                raise TMTCTransferError(
+                    'Transfer timed out (transfer aborted)')
+
+            exception_code = transfer_listener.exception_code
 
             if exception_code:
-                exception_name = self.model.id_to_onboard_exception_name(
-                    exception_code)
-                exception_description = \
-                    self.model.j_deployment_instance.getExceptions().getById(
-                        exception_code).getDescription()
                 raise TMTCTransferError(
                     'Exception occurred during transfer') from \
-                    OBSWExceptionError(
-                        exception_code,
-                        exception_name,
-                        exception_description)
+                    self._obsw_exception_error(exception_code)
 
         except Py4JJavaError as e:
             self.__handle_command_exception(e, 'Uplink failed')
 
-        except queue.Empty as e:
-            if j_transfer:
-                j_transfer.abort()
-            raise TMTCTransferError(
-                'Transfer timed out (transfer aborted)') from e
-
         finally:
             os.remove(tempfile_name)
 
@@ -2289,17 +2697,13 @@ class TMTCPy4j:
         # We need a file for the downlinked data. This is a limitation
         # of the Java API
 
-        # noinspection PyProtectedMember
         downlinked_data_filename = os.path.join(
             self._transfer_tmp.name,
-            next(tempfile._get_candidate_names()))
+            'downlink{:08x}'.format(next(self._downlink_file_ids)))
 
         j_file = self._gw.jvm.java.io.File(downlinked_data_filename)
 
-        completion_q = queue.Queue(maxsize=1)
-
         transfer_listener = _TransferListener(
-            completion_q,
             state_change_callback,
             progress_callback)
 
@@ -2314,30 +2718,25 @@ class TMTCPy4j:
             max_retries,
             transfer_listener)
 
-        try:
-
-            exception_code = completion_q.get(timeout=timeout / 1000)
-
-            if exception_code:
-                exception_name = self.model.id_to_onboard_exception_name(
-                    exception_code)
-                exception_description = \
-                    self.model.j_deployment_instance.getExceptions().getById(
-                        exception_code).getDescription()
-                raise TMTCTransferError(
-                    'Exception occurred during transfer') from \
-                    OBSWExceptionError(
-                        exception_code,
-                        exception_name,
-                        exception_description)
-
-        except queue.Empty:
+        if not transfer_listener.completed.wait(timeout / 1000):
             os.remove(downlinked_data_filename)
             transfer.abort()
-            raise TMTCTransferError('Transfer timed out') from None
+            raise TMTCTransferError('Transfer timed out')
 
-        with open(downlinked_data_filename, 'rb') as f:
-            downlinked_data = f.read()
+        exception_code = transfer_listener.exception_code
+
+        if exception_code:
+            raise TMTCTransferError(
+                'Exception occurred during transfer') from \
+                self._obsw_exception_error(exception_code)
+
+        # Read the file in one unbuffered call sized from the file itself;
+        # a resizing downlink may return fewer rows than requested
+        fd = os.open(downlinked_data_filename, os.O_RDONLY)
+        try:
+            downlinked_data = os.read(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
 
         os.remove(downlinked_data_filename)
 
@@ -2430,59 +2829,72 @@ class TMTCPy4j:
             self._command_handler.addEventListener(self.event_listener)
             self._command_handler.addDebugListener(self.debug_listener)
             self._command_handler.addHkListener(self.hk_listener)
+            self._disconnect_finalizer = weakref.finalize(
+                self,
+                _disconnect_space_link,
+                self._command_handler,
+                self._obsw_connection,
+                self.event_listener,
+                self.debug_listener,
+                self.hk_listener)
 
     @_requires_tmtc_connection
     def disconnect(self):
         """Disconnect from the onboard software"""
 
         if self._command_handler is not None:
-            self._command_handler.removeEventListener(self.event_listener)
-            self._command_handler.removeDebugListener(self.debug_listener)
-            self._command_handler.removeHkListener(self.hk_listener)
             self._command_handler = None
-            self._obsw_connection.disconnect()
+            # Runs _disconnect_space_link, at most once
+            self._disconnect_finalizer()
 
     def _from_gen1_type(self, java_object, param_def: ParameterDefinition):
-        # We get a com.brightascension.gen1.util.ByteArray back from
-        # Java side; lookup Parameter type, and return appropriately
-        # represented value
-        if param_def.type_str in [TypeStr.unsigned,
-                                  TypeStr.bitfield]:
-
-            if param_def.type_str == TypeStr.bitfield and \
-                    param_def.bits_per_row == 1:
-                # Special case, treat as boolean
-                return java_object.getUnsignedValue() != 0
-            else:
-                return java_object.getUnsignedValue()
+        return self._gen1_decoder(param_def)(java_object)
+
+    def _gen1_decoder(self, param_def: ParameterDefinition):
+        """Return a function that converts the
+        com.brightascension.gen1.util.ByteArray values we get back from Java
+        side to the python representation for param_def's type
+
+        Choosing the conversion once lets multi-row gets skip the type
+        checks for each row.
+
+        """
+        if param_def.type_str == TypeStr.bitfield and \
+                param_def.bits_per_row == 1:
+            # Special case, treat as boolean
+            return lambda java_object: java_object.getUnsignedValue() != 0
+
+        elif param_def.type_str in [TypeStr.unsigned,
+                                    TypeStr.bitfield]:
+            return lambda java_object: java_object.getUnsignedValue()
 
         elif param_def.type_str == TypeStr.signed:
-            return java_object.getSignedValue()
+            return lambda java_object: java_object.getSignedValue()
 
         elif param_def.type_str == TypeStr.float:
-            float_value = java_object.getBytes()
-            return struct.unpack('f' if len(float_value) == 4 else 'd',
-                                 java_object.getBytes())[0]
+            def _float(java_object):
+                float_value = java_object.getBytes()
+                return _float_structs[
+                    4 if len(float_value) == 4 else 8].unpack(float_value)[0]
+            return _float
 
         elif param_def.type_str == TypeStr.parameterref:
-            try:
-                # Attempt lookup of parameter name
-                return self.model.parameter_instance(
-                    java_object.getUnsignedValue()).full_name
-            except TMTCModelQueryError:
-                return java_object.getUnsignedValue()
+            def _parameter_ref(java_object):
+                parameter_id = java_object.getUnsignedValue()
+                try:
+                    # Attempt lookup of parameter name
+                    return self.model.parameter_instance(
+                        parameter_id).full_name
+                except TMTCModelQueryError:
+                    return parameter_id
+            return _parameter_ref
 
         else:  # Raw/Varaw
-            return java_object.getBytes()
+            return lambda java_object: java_object.getBytes()
 
     def _to_gen1_type(self, value, parameter_type: ParameterDefinition,
                       validate_len=False) -> bytes:
 
-        def twos_complement_range(n):
-            _min = -(2 ** (n - 1))
-            _max = 2 ** (n - 1) - 1
-            return _min, _max
-
         try:
             # Special case, we accept parameter name strings for param refs
             if parameter_type.type_str == TypeStr.parameterref and type(
@@ -2497,9 +2909,9 @@ class TMTCPy4j:
 
             elif parameter_type.type_str == TypeStr.signed:
 
-                lower, upper = twos_complement_range(
-                    parameter_type.bits_per_row)
-                if not lower <= value <= upper:
+                # Two's complement range of the row width
+                half_range = 1 << (parameter_type.bits_per_row - 1)
+                if not -half_range <= value < half_range:
                     raise ValueError(
                         "value outwith signed {}-bit range".format(
                             parameter_type.bits_per_row))
@@ -2508,20 +2920,21 @@ class TMTCPy4j:
                                       signed=True)
 
             elif parameter_type.type_str == TypeStr.float:
-                return struct.pack(
-                    'f' if parameter_type.bytes_per_row == 4 else 'd',
-                    value)
+                return _float_structs[
+                    4 if parameter_type.bytes_per_row == 4 else 8].pack(value)
 
             elif parameter_type.type_str in [TypeStr.raw, TypeStr.varaw]:
                 if parameter_type.type_class == TypeClass.var_raw:
-                    # Variable Raw
-                    try:
-                        memoryview(value)
-                    except TypeError as e:
-                        raise TypeError(
-                            "for Varaw type parameters a "
-                            "bytes-like object is expected, got {}".format(
-                                type(value).__name__)) from e
+                    # Variable Raw: any bytes-like object. Only build a
+                    # memoryview to check less common types
+                    if type(value) not in (bytes, bytearray):
+                        try:
+                            memoryview(value)
+                        except TypeError as e:
+                            raise TypeError(
+                                "for Varaw type parameters a "
+                                "bytes-like object is expected, got {}".format(
+                                    type(value).__name__)) from e
 
                     if parameter_type.min_rows <= len(
                             value) <= parameter_type.bytes_per_row:
@@ -2540,8 +2953,8 @@ class TMTCPy4j:
                                               'big', signed=False)
                     except AttributeError:
                         # value is already bytes, validate len
-                        if len(value) is not parameter_type.bytes_per_row and \
-                                validate_len:
+                        if validate_len and \
+                                len(value) != parameter_type.bytes_per_row:
                             raise ValueError(
                                 'Provided bytearray wrong length. '
                                 'Expected {}, got {}'.format(
@@ -2556,42 +2969,55 @@ class TMTCPy4j:
                 'Cannot convert {} to Gen1 {} type'.format(
                     type(value).__name__, parameter_type.type_str), e) from e
 
+    def _obsw_exception_error(self, exception_code) -> OBSWExceptionError:
+        """Create the error describing an onboard exception code
+
+        The exception's name and description come from the (memoized)
+        spacecraft database lookup, so repeated failures with the same code
+        don't go back to Java.
+
+        """
+        onboard_exception = self.model.onboard_exception(exception_code)
+        return OBSWExceptionError(exception_code,
+                                  onboard_exception.full_name,
+                                  onboard_exception.description)
+
     def __handle_command_exception(self, e, message=None):
         s = e.java_exception.toString()
-        if s.startswith(
-                'com.brightascension.gen1.protocol.cmd.SyncCommandException'):
+        # Java exception strings are '<exception class>: <detail>'
+        exception_class, _, detail = s.partition(': ')
+
+        if exception_class == \
+                'com.brightascension.gen1.protocol.cmd.SyncCommandException':
             exception_code = e.java_exception.getException()
-            exception_name = self.model.id_to_onboard_exception_name(
-                exception_code)
-            exception_description = \
-                self.model.j_deployment_instance.getExceptions().getById(
-                    exception_code).getDescription()
-            logging.info('NACK: {}: {}'.format(exception_code, exception_name))
-            raise OBSWExceptionError(exception_code, exception_name,
-                                     exception_description) from None
-
-        elif s.startswith(
-                'com.brightascension.gen1.protocol.cmd.CommandException'):
+            obsw_exception_error = self._obsw_exception_error(exception_code)
+            logging.info('NACK: {}: {}'.format(
+                exception_code, obsw_exception_error.args[1]))
+            raise obsw_exception_error from None
+
+        elif exception_class == \
+                'com.brightascension.gen1.protocol.cmd.CommandException':
 
             logging.error(
                 message + ''
                           'Command Exception: '
                           ' OBSW instance may not be reachable.')
 
+            cause = e.java_exception.getCause()
             raise TMTCCommandError(
                 'Command failed ({}: {}). '
                 'OBSW instance may not be reachable.'.format(
-                    s.split(': ', 1)[1],
-                    e.java_exception.getCause().toString().split(': ', 1)[1]
-                    if e.java_exception.getCause() else ''
+                    detail,
+                    cause.toString().partition(': ')[2]
+                    if cause is not None else ''
                 )) from None
 
-        elif s.startswith(
-                'com.brightascension.gen1.protocol.transfer.TransferException'):
-            raise TMTCTransferError(s.split(': ', 1)[1])
+        elif exception_class == \
+                'com.brightascension.gen1.protocol.transfer.TransferException':
+            raise TMTCTransferError(detail)
 
         else:
-            logging.error(e.java_exception.toString())
+            logging.error(s)
             raise e
 
     def __enter__(self):
@@ -2599,13 +3025,7 @@ class TMTCPy4j:
         return self
 
     def __exit__(self, *args):
-        # make sure we disconnect the space link
-        self.disconnect()
-
-    def __del__(self):
-
-        if getattr(self, '_command_handler', None):
+        # make sure we disconnect the space link, unless that has already
+        # been done (disconnect() raises TMTCDisconnected if so)
+        if self._command_handler is not None:
             self.disconnect()
-
-        # unlink transfers directory
-        self._transfer_tmp.cleanup()